@@ -1,98 +1,179 @@
 import os
-from pathlib import Path
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional, Pattern
 from dotenv import load_dotenv
 
-# Load environment variables from .env file (if it exists locally)
 backend_dir = os.path.dirname(os.path.dirname(__file__))
-env_path = os.path.join(backend_dir, ".env")
-if os.path.exists(env_path):
-    load_dotenv(env_path)
 
-# Get environment
-ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 
-# Determine database path based on environment
-# Note: On Vercel (production), the filesystem is ephemeral and read-only
-# Using in-memory SQLite for now - consider using PostgreSQL for real persistence
-if ENVIRONMENT == "production":
-    # Use in-memory database on Vercel since /tmp is read-only
-    DB_PATH = "sqlite:///:memory:"
-    print("⚠️  WARNING: Using in-memory SQLite database on production. Data will not persist.")
-    print("For production, configure a cloud database (PostgreSQL, MySQL, etc.)")
-else:
-    DB_PATH = f"sqlite:///{os.path.join(backend_dir, 'ol_poddo.db')}"
+def _compile_origin_patterns(origins):
+    """Compile wildcard origins (e.g. "https://*.vercel.app") into one regex, or None if there are none"""
+    patterns = [re.escape(origin).replace(r"\*", r"[^./]+") for origin in origins if "*" in origin]
+    return re.compile("|".join(patterns)) if patterns else None
 
 
+def _backend_path(relative: Optional[str]) -> Optional[str]:
+    """Resolve a path relative to the backend directory, or None if it is unset or missing"""
+    if not relative:
+        return None
+    path = os.path.join(backend_dir, relative)
+    return path if os.path.exists(path) else None
+
+
+def _split_env(name: str, default: tuple) -> tuple:
+    """Read a comma-separated environment variable as a tuple, or the default if it is unset"""
+    value = os.getenv(name)
+    if not value:
+        return default
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+CORS_ORIGINS = (
+    "http://localhost",
+    "http://localhost:3000",
+    "http://localhost:5173",
+    "http://127.0.0.1",
+    "http://127.0.0.1:3000",
+    "http://127.0.0.1:5173",
+    "https://ol-poddo.vercel.app",
+    "https://www.ol-poddo.vercel.app",
+    "https://ol-poddo-backend.vercel.app",
+)
+
+ALLOWED_HOSTS = (
+    "localhost",
+    "127.0.0.1",
+    "*.localhost",
+    "ol-poddo-backend.vercel.app",
+    "*.vercel.app",
+)
+
+
+@dataclass(frozen=True, slots=True)
 class Settings:
-    """Application settings"""
-    
+    """Application settings (resolved once by get_settings, read-only afterwards)"""
+
     # App settings
+    environment: str
+    database_url: str
     app_name: str = "OL-Poddo API"
-    environment: str = ENVIRONMENT
-    debug: bool = ENVIRONMENT == "development"
-    
+    debug: bool = False
+
     # Database settings
-    db_path: str = DB_PATH
-    database_url: str = DB_PATH
-    
+    # Connection pool (file-backed SQLite and server databases)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_recycle: int = 280  # seconds, below typical server idle timeouts
+    db_pool_timeout: int = 30
+    is_vercel: bool = False
+    # Create tables and seed data on startup (set RUN_SCHEMA_BOOTSTRAP=0 when migrations run out-of-band)
+    run_schema_bootstrap: bool = True
+    # Serve /api/docs, /api/redoc and /api/openapi.json (off in production unless API_DOCS=1)
+    api_docs: bool = True
+
     # Security settings
-    secret_key: str = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production")
+    secret_key: str = "your-secret-key-change-this-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
-    
+    # Seconds a verified token's claims are reused without re-checking the signature (0 disables)
+    jwt_cache_ttl: int = 5
+
+    # Host header allow-list ("*." entries match one subdomain label)
+    allowed_hosts: tuple = ALLOWED_HOSTS
+
     # CORS settings
-    cors_origins: list = [
-        "http://localhost",
-        "http://localhost:3000",
-        "http://localhost:5173",
-        "http://127.0.0.1",
-        "http://127.0.0.1:3000",
-        "http://127.0.0.1:5173",
-        "https://ol-poddo.vercel.app",
-        "https://www.ol-poddo.vercel.app",
-        "https://ol-poddo-backend.vercel.app",
-    ]
-    
-    # Email settings (for future use)
-    smtp_server: str = os.getenv("SMTP_SERVER", "")
-    smtp_port: int = int(os.getenv("SMTP_PORT", 587))
-    smtp_user: str = os.getenv("SMTP_USER", "")
-    smtp_password: str = os.getenv("SMTP_PASSWORD", "")
-    
+    cors_origins: tuple = CORS_ORIGINS
+    # Precomputed origin matchers: exact entries as a frozenset, wildcard entries as one regex
+    cors_origins_exact: frozenset = field(init=False)
+    cors_origins_regex: Optional[Pattern] = field(init=False)
+
+    # Email settings
+    smtp_server: str = ""
+    smtp_port: int = 587
+    smtp_user: str = ""
+    smtp_password: str = ""
+    # Background SMTP senders, one connection each (0 sends inline in the request)
+    email_workers: int = 5
+
     # Google Drive settings
-    # Resolve the path relative to the backend directory
-    _backend_dir = backend_dir
-    
     # OAuth2 credentials (preferred - uses your personal Google account)
-    _google_oauth_relative = os.getenv("GOOGLE_OAUTH_CREDENTIALS_JSON", None)
-    google_oauth_credentials_json: str = (
-        os.path.join(_backend_dir, _google_oauth_relative) 
-        if _google_oauth_relative and os.path.exists(os.path.join(_backend_dir, _google_oauth_relative))
-        else None
-    )
-    
+    google_oauth_credentials_json: Optional[str] = None
     # Service Account credentials (deprecated - use OAuth2 instead)
-    _google_key_relative = os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON", None)
-    google_service_account_json: str = (
-        os.path.join(_backend_dir, _google_key_relative) 
-        if _google_key_relative and os.path.exists(os.path.join(_backend_dir, _google_key_relative))
-        else None
-    )
-    
-    google_drive_papers_folder_id: str = os.getenv("GOOGLE_DRIVE_PAPERS_FOLDER_ID", "")
-    google_drive_textbooks_folder_id: str = os.getenv("GOOGLE_DRIVE_TEXTBOOKS_FOLDER_ID", "")
-    google_drive_notes_folder_id: str = os.getenv("GOOGLE_DRIVE_NOTES_FOLDER_ID", "")
-    
+    google_service_account_json: Optional[str] = None
+    google_drive_papers_folder_id: str = ""
+    google_drive_textbooks_folder_id: str = ""
+    google_drive_notes_folder_id: str = ""
+
     # Google OAuth for user authentication
-    google_oauth_client_id: str = os.getenv("GOOGLE_OAUTH_CLIENT_ID", "")
-    google_oauth_client_secret: str = os.getenv("GOOGLE_OAUTH_CLIENT_SECRET", "")
-    google_oauth_redirect_uri: str = os.getenv(
-        "GOOGLE_OAUTH_REDIRECT_URI", 
-        "https://ol-poddo.vercel.app/auth/google/callback" if ENVIRONMENT == "production" else "http://localhost:5173/auth/google/callback"
+    google_oauth_client_id: str = ""
+    google_oauth_client_secret: str = ""
+    google_oauth_redirect_uri: str = "http://localhost:5173/auth/google/callback"
+
+    def __post_init__(self):
+        object.__setattr__(self, "cors_origins_exact", frozenset(o for o in self.cors_origins if "*" not in o))
+        object.__setattr__(self, "cors_origins_regex", _compile_origin_patterns(self.cors_origins))
+
+    @property
+    def db_path(self) -> str:
+        return self.database_url
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Read .env and the environment once and freeze the result"""
+    # Load environment variables from .env file (if it exists locally)
+    env_path = os.path.join(backend_dir, ".env")
+    if os.path.exists(env_path):
+        load_dotenv(env_path)
+
+    environment = os.getenv("ENVIRONMENT", "development")
+
+    # Determine database path based on environment
+    # Note: On Vercel (production), the filesystem is ephemeral and read-only
+    # Using in-memory SQLite for now - consider using PostgreSQL for real persistence
+    if environment == "production":
+        # Use in-memory database on Vercel since /tmp is read-only
+        database_url = "sqlite:///:memory:"
+        print("⚠️  WARNING: Using in-memory SQLite database on production. Data will not persist.")
+        print("For production, configure a cloud database (PostgreSQL, MySQL, etc.)")
+    else:
+        database_url = f"sqlite:///{os.path.join(backend_dir, 'ol_poddo.db')}"
+
+    return Settings(
+        environment=environment,
+        database_url=database_url,
+        debug=environment == "development",
+        db_pool_size=int(os.getenv("DB_POOL_SIZE", 5)),
+        db_max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 10)),
+        db_pool_recycle=int(os.getenv("DB_POOL_RECYCLE", 280)),
+        db_pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", 30)),
+        is_vercel=bool(os.getenv("VERCEL")),
+        run_schema_bootstrap=os.getenv("RUN_SCHEMA_BOOTSTRAP", "1") == "1",
+        api_docs=os.getenv("API_DOCS", "0" if environment == "production" else "1") == "1",
+        secret_key=os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production"),
+        allowed_hosts=_split_env("ALLOWED_HOSTS", ALLOWED_HOSTS),
+        jwt_cache_ttl=int(os.getenv("JWT_CACHE_TTL", 5)),
+        smtp_server=os.getenv("SMTP_SERVER", ""),
+        smtp_port=int(os.getenv("SMTP_PORT", 587)),
+        smtp_user=os.getenv("SMTP_USER", ""),
+        smtp_password=os.getenv("SMTP_PASSWORD", ""),
+        email_workers=int(os.getenv("EMAIL_WORKERS", 5)),
+        google_oauth_credentials_json=_backend_path(os.getenv("GOOGLE_OAUTH_CREDENTIALS_JSON")),
+        google_service_account_json=_backend_path(os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON")),
+        google_drive_papers_folder_id=os.getenv("GOOGLE_DRIVE_PAPERS_FOLDER_ID", ""),
+        google_drive_textbooks_folder_id=os.getenv("GOOGLE_DRIVE_TEXTBOOKS_FOLDER_ID", ""),
+        google_drive_notes_folder_id=os.getenv("GOOGLE_DRIVE_NOTES_FOLDER_ID", ""),
+        google_oauth_client_id=os.getenv("GOOGLE_OAUTH_CLIENT_ID", ""),
+        google_oauth_client_secret=os.getenv("GOOGLE_OAUTH_CLIENT_SECRET", ""),
+        google_oauth_redirect_uri=os.getenv(
+            "GOOGLE_OAUTH_REDIRECT_URI",
+            "https://ol-poddo.vercel.app/auth/google/callback" if environment == "production" else "http://localhost:5173/auth/google/callback"
+        ),
     )
 
 
 # Create settings instance
-settings = Settings()
-
+settings = get_settings()
@@ -1,17 +1,67 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import JSON, CheckConstraint, String, create_engine, event
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
 from .config import settings
 
+# A plain ":memory:" SQLite DB is private to one connection, so use a named shared-cache
+# in-memory DB instead - the sync and async engines then see the same tables
+IN_MEMORY = settings.database_url == "sqlite:///:memory:"
+DATABASE_URL = "sqlite:///file:ol_poddo?mode=memory&cache=shared&uri=true" if IN_MEMORY else settings.database_url
+
+
+def get_async_url(url: str) -> str:
+    """Map a sync database URL onto its asyncio driver (only SQLite -> aiosqlite is bundled)"""
+    scheme, sep, rest = url.partition("://")
+    if scheme == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    return url
+
+
+def get_pool_options(url: str, is_async: bool = False) -> dict:
+    """Connection pool arguments for create_engine/create_async_engine"""
+    if IN_MEMORY:
+        return {}
+    return {
+        # Explicit because SQLAlchemy defaults aiosqlite file databases to NullPool
+        "poolclass": AsyncAdaptedQueuePool if is_async else QueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_pre_ping": True,  # Drop connections the server closed while the instance was idle
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_use_lifo": True,  # Reuse the warmest connection; idle overflow connections age out sooner
+    }
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets readers run alongside a writer; NORMAL sync is safe with WAL and avoids an fsync per commit"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    # Keep temp tables/sort spills in RAM, read the file through a 256 MiB mmap, 64 MiB page cache
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.close()
+
+
 # Create database engine
 # On Vercel, the filesystem is ephemeral and read-only, so SQLite won't work
 # This is a fallback setup - in production, use a cloud database
 try:
     engine = create_engine(
-        settings.database_url,
-        connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {},
+        DATABASE_URL,
+        connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
+        # The in-memory DB only lives while a connection to it is open, so keep a single
+        # connection for the sync engine for the lifetime of the process
+        **({"poolclass": StaticPool} if IN_MEMORY else get_pool_options(DATABASE_URL)),
         echo=False
     )
+    if DATABASE_URL.startswith("sqlite") and not IN_MEMORY:
+        event.listen(engine, "connect", _set_sqlite_pragmas)
     # Test the connection
     with engine.connect() as conn:
         pass
@@ -23,13 +73,47 @@ except Exception as e:
 
 # Create session factory
 if engine is not None:
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # Committed objects keep their loaded state, so reading them back costs no extra SELECT
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 else:
     SessionLocal = None
 
+# Async engine for handlers that await their queries instead of holding a worker thread
+try:
+    async_engine = (
+        create_async_engine(get_async_url(DATABASE_URL), echo=False, **get_pool_options(DATABASE_URL, is_async=True))
+        if engine is not None else None
+    )
+except Exception as e:
+    print(f"Warning: Could not create async database engine: {e}")
+    async_engine = None
+
+if async_engine is not None and DATABASE_URL.startswith("sqlite") and not IN_MEMORY:
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+if async_engine is not None:
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+else:
+    AsyncSessionLocal = None
+
 # Base for models
 Base = declarative_base()
 
+# Tag lists: native text[] on PostgreSQL (GIN-indexable), a JSON array elsewhere
+TagList = JSON().with_variant(ARRAY(String), "postgresql")
+
+
+def enum_check(column: str, enum_cls) -> CheckConstraint:
+    """CHECK constraint limiting a plain String column to the values of a Python enum"""
+    values = ", ".join(f"'{member.value}'" for member in enum_cls)
+    return CheckConstraint(f"{column} IN ({values})")
+
+
+def split_tags(raw):
+    """Turn a comma-separated tags parameter into a TagList value (None when empty)"""
+    tags = [tag.strip() for tag in raw.split(",") if tag.strip()] if raw else []
+    return tags or None
+
 
 def get_db():
     """Dependency to get database session"""
@@ -38,5 +122,17 @@ def get_db():
     db = SessionLocal()
     try:
         yield db
+    except Exception:
+        # Hand the connection back to the pool without a half-finished transaction
+        db.rollback()
+        raise
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency to get an async database session"""
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Database is not available. This is expected on Vercel.")
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,94 +1,307 @@
+import asyncio
+import base64
+import hashlib
+import html
 import os
-import secrets
 import smtplib
+import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional
+from typing import List, Optional
 from .config import settings
 
 
-def generate_token(length: int = 32) -> str:
-    """Generate a secure random token"""
-    return secrets.token_urlsafe(length)
+class SmtpPool:
+    """Keeps one authenticated SMTP connection per thread and reuses it across sends"""
 
+    # Recycle a connection after this many messages or seconds, whichever comes first
+    MAX_MESSAGES = 1000
+    MAX_AGE = 600
 
-def send_verification_email(email: str, username: str, token: str, frontend_url: str = "http://localhost:5173") -> bool:
-    """
-    Send email verification link
-    
-    Args:
-        email: User email address
-        username: User username
-        token: Verification token
-        frontend_url: Frontend URL for the verification link
-    
-    Returns:
-        True if email sent successfully, False otherwise
-    """
-    
-    # If SMTP settings are not configured, just return True (for development)
-    if not settings.smtp_server or not settings.smtp_user:
-        print(f"[DEV] Verification token for {email}: {token}")
-        print(f"[DEV] Verification link: {frontend_url}/verify?token={token}")
-        return True
-    
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, host: str, port: int, user: str, password: str):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self._local = threading.local()
+
+    @classmethod
+    def instance(cls) -> "SmtpPool":
+        """Process-wide pool built from settings on first use"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls(settings.smtp_server, settings.smtp_port, settings.smtp_user, settings.smtp_password)
+        return cls._instance
+
+    def _connect(self) -> smtplib.SMTP:
+        """Open, secure and authenticate a new connection for this thread"""
+        server = smtplib.SMTP(self.host, self.port, timeout=30)
+        server.starttls()
+        server.login(self.user, self.password)
+        self._local.server = server
+        self._local.sent = 0
+        self._local.opened_at = time.monotonic()
+        return server
+
+    def _close(self):
+        """Drop this thread's connection, ignoring errors from an already dead socket"""
+        server = getattr(self._local, "server", None)
+        self._local.server = None
+        if server is not None:
+            try:
+                server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+
+    def _get_connection(self) -> smtplib.SMTP:
+        """Return a live connection, reconnecting if it is stale, recycled or dead"""
+        server = getattr(self._local, "server", None)
+        if server is not None:
+            if self._local.sent >= self.MAX_MESSAGES or time.monotonic() - self._local.opened_at > self.MAX_AGE:
+                self._close()
+                server = None
+            else:
+                try:
+                    if server.noop()[0] != 250:
+                        raise smtplib.SMTPServerDisconnected("NOOP failed")
+                except (smtplib.SMTPException, OSError):
+                    self._close()
+                    server = None
+        return server if server is not None else self._connect()
+
+    def send(self, msg):
+        """Send a message over the pooled connection"""
+        server = self._get_connection()
+        try:
+            server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # Dropped between the health check and the send; retry once on a fresh connection
+            self._close()
+            self._connect().send_message(msg)
+        self._local.sent += 1
+
+
+# SMTP reply codes worth retrying (service unavailable / mailbox busy / local error / out of storage)
+TRANSIENT_SMTP_CODES = {421, 450, 451, 452}
+MAX_SEND_RETRIES = 3
+
+_email_queue: Optional[asyncio.Queue] = None
+_email_loop: Optional[asyncio.AbstractEventLoop] = None
+_email_workers: List[asyncio.Task] = []
+
+
+def _requeue(queue: asyncio.Queue, item):
+    """Put a message back for another attempt, then retire the failed one"""
+    queue.put_nowait(item)
+    queue.task_done()
+
+
+async def _email_worker(queue: asyncio.Queue):
+    """Send queued messages on a dedicated thread, so each worker owns one pooled SMTP connection"""
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="smtp") as executor:
+        while True:
+            msg, attempt = await queue.get()
+            retrying = False
+            try:
+                await loop.run_in_executor(executor, SmtpPool.instance().send, msg)
+            except (smtplib.SMTPResponseException, smtplib.SMTPServerDisconnected) as e:
+                code = getattr(e, "smtp_code", 421)
+                if code in TRANSIENT_SMTP_CODES and attempt < MAX_SEND_RETRIES:
+                    # Exponential backoff without holding up the worker; the message stays unfinished
+                    # until it is re-queued, so queue.join() at shutdown waits for the retry
+                    loop.call_later(2 ** attempt, _requeue, queue, (msg, attempt + 1))
+                    retrying = True
+                else:
+                    print(f"Error sending email to {msg['To']}: {e}")
+            except Exception as e:
+                print(f"Error sending email to {msg['To']}: {e}")
+            finally:
+                if not retrying:
+                    queue.task_done()
+
+
+def start_email_workers(count: Optional[int] = None):
+    """Start the background senders (call from the app's startup hook)"""
+    global _email_queue, _email_loop
+    count = settings.email_workers if count is None else count
+    # Serverless instances may freeze after the response, so queued mail could be lost there
+    if _email_queue is not None or count <= 0 or settings.is_vercel or not settings.smtp_server:
+        return
+    _email_loop = asyncio.get_running_loop()
+    _email_queue = asyncio.Queue()
+    _email_workers.extend(asyncio.create_task(_email_worker(_email_queue)) for _ in range(count))
+
+
+async def stop_email_workers(timeout: float = 10):
+    """Give queued mail a chance to go out, then stop the senders (call from the shutdown hook)"""
+    global _email_queue, _email_loop
+    if _email_queue is None:
+        return
     try:
-        verification_link = f"{frontend_url}/verify?token={token}"
-        
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = "Verify Your Email Address"
-        msg['From'] = settings.smtp_user
-        msg['To'] = email
-        
-        # HTML content
-        html_content = f"""
+        await asyncio.wait_for(_email_queue.join(), timeout)
+    except asyncio.TimeoutError:
+        print(f"Warning: {_email_queue.qsize()} queued emails were not sent before shutdown")
+    for task in _email_workers:
+        task.cancel()
+    await asyncio.gather(*_email_workers, return_exceptions=True)
+    _email_workers.clear()
+    _email_queue = None
+    _email_loop = None
+
+
+def deliver(msg):
+    """Hand a message to the background senders, or send it inline when they are not running"""
+    if _email_queue is None:
+        SmtpPool.instance().send(msg)
+    else:
+        # Thread-safe, so sync handlers running in the threadpool can enqueue too
+        _email_loop.call_soon_threadsafe(_email_queue.put_nowait, (msg, 0))
+
+
+def _template(text: str) -> string.Template:
+    """Compile an email body once, with the app name already filled in"""
+    return string.Template(string.Template(text).safe_substitute(app_name=settings.app_name))
+
+
+_VERIFY_HTML = _template("""
         <html>
             <body style="font-family: Arial, sans-serif;">
-                <h2>Welcome to {settings.app_name}!</h2>
-                <p>Hi {username},</p>
+                <h2>Welcome to $app_name!</h2>
+                <p>Hi $username,</p>
                 <p>Please verify your email address by clicking the button below:</p>
                 <p>
-                    <a href="{verification_link}" style="background-color: #4CAF50; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block;">
+                    <a href="$link" style="background-color: #4CAF50; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block;">
                         Verify Email
                     </a>
                 </p>
                 <p>Or copy and paste this link in your browser:</p>
-                <p>{verification_link}</p>
+                <p>$link</p>
                 <p>This link will expire in 24 hours.</p>
                 <p>If you didn't create this account, please ignore this email.</p>
                 <br>
-                <p>Best regards,<br>{settings.app_name} Team</p>
+                <p>Best regards,<br>$app_name Team</p>
             </body>
         </html>
-        """
-        
-        # Plain text content
-        text_content = f"""
-        Welcome to {settings.app_name}!
+        """)
+
+_VERIFY_TEXT = _template("""
+        Welcome to $app_name!
         
-        Hi {username},
+        Hi $username,
         
         Please verify your email address by visiting this link:
-        {verification_link}
+        $link
         
         This link will expire in 24 hours.
         
         If you didn't create this account, please ignore this email.
         
         Best regards,
-        {settings.app_name} Team
-        """
+        $app_name Team
+        """)
+
+_RESET_HTML = _template("""
+        <html>
+            <body style="font-family: Arial, sans-serif;">
+                <h2>Password Reset Request</h2>
+                <p>Hi $username,</p>
+                <p>We received a password reset request for your account. Click the button below to reset your password:</p>
+                <p>
+                    <a href="$link" style="background-color: #4CAF50; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block;">
+                        Reset Password
+                    </a>
+                </p>
+                <p>Or copy and paste this link in your browser:</p>
+                <p>$link</p>
+                <p>This link will expire in 1 hour.</p>
+                <p>If you didn't request a password reset, please ignore this email.</p>
+                <br>
+                <p>Best regards,<br>$app_name Team</p>
+            </body>
+        </html>
+        """)
+
+_RESET_TEXT = _template("""
+        Password Reset Request
         
-        # Attach both plain text and HTML
-        msg.attach(MIMEText(text_content, 'plain'))
-        msg.attach(MIMEText(html_content, 'html'))
+        Hi $username,
         
-        # Send email
-        with smtplib.SMTP(settings.smtp_server, settings.smtp_port) as server:
-            server.starttls()
-            server.login(settings.smtp_user, settings.smtp_password)
-            server.send_message(msg)
+        We received a password reset request for your account. Visit this link to reset your password:
+        $link
+        
+        This link will expire in 1 hour.
+        
+        If you didn't request a password reset, please ignore this email.
+        
+        Best regards,
+        $app_name Team
+        """)
+
+
+def _build_message(email: str, subject: str, text_content: str, html_content: str) -> MIMEMultipart:
+    """Assemble the multipart/alternative message (plain text first, HTML preferred)"""
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = settings.smtp_user
+    msg['To'] = email
+    msg.attach(MIMEText(text_content, 'plain'))
+    msg.attach(MIMEText(html_content, 'html'))
+    return msg
+
+
+_b64encode = base64.urlsafe_b64encode
+_urandom = os.urandom
+
+
+def generate_token(length: int = 32) -> str:
+    """Generate a secure random URL-safe token from `length` random bytes"""
+    return _b64encode(_urandom(length)).rstrip(b"=").decode("ascii")
+
+
+def hash_token(token: str) -> str:
+    """SHA-256 hex digest of a token; only the digest is stored, the raw token goes out by email"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def send_verification_email(email: str, username: str, token: str, frontend_url: str = "http://localhost:5173") -> bool:
+    """
+    Send email verification link
+    
+    Args:
+        email: User email address
+        username: User username
+        token: Verification token
+        frontend_url: Frontend URL for the verification link
+    
+    Returns:
+        True if email sent successfully, False otherwise
+    """
+    
+    # If SMTP settings are not configured, just return True (for development)
+    if not settings.smtp_server or not settings.smtp_user:
+        print(f"[DEV] Verification token for {email}: {token}")
+        print(f"[DEV] Verification link: {frontend_url}/verify?token={token}")
+        return True
+    
+    try:
+        verification_link = f"{frontend_url}/verify?token={token}"
+        msg = _build_message(
+            email,
+            "Verify Your Email Address",
+            _VERIFY_TEXT.substitute(username=username, link=verification_link),
+            _VERIFY_HTML.substitute(username=html.escape(username), link=verification_link),
+        )
+        
+        # Queue for the background senders (or send inline over the shared connection)
+        deliver(msg)
         
         return True
     
@@ -119,61 +332,15 @@ def send_password_reset_email(email: str, username: str, token: str, frontend_ur
     
     try:
         reset_link = f"{frontend_url}/reset-password?token={token}"
+        msg = _build_message(
+            email,
+            "Password Reset Request",
+            _RESET_TEXT.substitute(username=username, link=reset_link),
+            _RESET_HTML.substitute(username=html.escape(username), link=reset_link),
+        )
         
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = "Password Reset Request"
-        msg['From'] = settings.smtp_user
-        msg['To'] = email
-        
-        # HTML content
-        html_content = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif;">
-                <h2>Password Reset Request</h2>
-                <p>Hi {username},</p>
-                <p>We received a password reset request for your account. Click the button below to reset your password:</p>
-                <p>
-                    <a href="{reset_link}" style="background-color: #4CAF50; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block;">
-                        Reset Password
-                    </a>
-                </p>
-                <p>Or copy and paste this link in your browser:</p>
-                <p>{reset_link}</p>
-                <p>This link will expire in 1 hour.</p>
-                <p>If you didn't request a password reset, please ignore this email.</p>
-                <br>
-                <p>Best regards,<br>{settings.app_name} Team</p>
-            </body>
-        </html>
-        """
-        
-        # Plain text content
-        text_content = f"""
-        Password Reset Request
-        
-        Hi {username},
-        
-        We received a password reset request for your account. Visit this link to reset your password:
-        {reset_link}
-        
-        This link will expire in 1 hour.
-        
-        If you didn't request a password reset, please ignore this email.
-        
-        Best regards,
-        {settings.app_name} Team
-        """
-        
-        # Attach both plain text and HTML
-        msg.attach(MIMEText(text_content, 'plain'))
-        msg.attach(MIMEText(html_content, 'html'))
-        
-        # Send email
-        with smtplib.SMTP(settings.smtp_server, settings.smtp_port) as server:
-            server.starttls()
-            server.login(settings.smtp_user, settings.smtp_password)
-            server.send_message(msg)
+        # Queue for the background senders (or send inline over the shared connection)
+        deliver(msg)
         
         return True
     
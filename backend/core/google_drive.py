@@ -3,55 +3,237 @@ Google Drive integration for storing and retrieving documents
 """
 import os
 import io
+import json
+import logging
 import uuid
-from typing import Optional, Tuple
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial, wraps
+from cachetools import TTLCache
+from typing import BinaryIO, Iterable, List, Optional, Tuple
+import google_auth_httplib2
+import httplib2
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload
+from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload, MediaIoBaseUpload
 from googleapiclient.errors import HttpError
 from ..core.config import settings
 
+log = logging.getLogger("ol_poddo.drive")
+
+# Blocking Drive calls run here rather than in the shared default threadpool,
+# sized to the number of concurrent Drive requests we want in flight
+_DRIVE_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="drive")
+
+
+async def _run_in_drive_executor(func, *args, **kwargs):
+    """Await a blocking Drive call on the dedicated executor"""
+    return await asyncio.get_running_loop().run_in_executor(_DRIVE_EXECUTOR, partial(func, *args, **kwargs))
+
+
+# Transient Drive errors worth retrying: rate limiting and server-side failures
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 32.0
+
+
+def _retry_delay(error: HttpError, attempt: int) -> float:
+    """Seconds to wait before the next attempt: the server's Retry-After, else capped exponential backoff with jitter"""
+    retry_after = error.resp.get('retry-after')
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), RETRY_MAX_DELAY)
+    return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) + random.uniform(0, RETRY_BASE_DELAY)
+
+
+def _retry(fn):
+    """Retry a blocking Drive call on 429/5xx responses"""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                return fn(*args, **kwargs)
+            except HttpError as error:
+                if error.resp.status not in RETRY_STATUSES or attempt == MAX_ATTEMPTS - 1:
+                    raise
+                delay = _retry_delay(error, attempt)
+                log.warning("Drive %s returned %s, retrying in %.1fs", fn.__name__, error.resp.status, delay)
+                time.sleep(delay)
+    return wrapper
+
+
+def direct_download_url(file_id: str) -> str:
+    """Direct download link (bypasses Google's virus-scan interstitial for most files)"""
+    return f"https://drive.google.com/uc?export=download&id={file_id}"
+
+
+def preview_url(file_id: str) -> str:
+    """Embeddable preview URL (works in an <iframe>)"""
+    return f"https://drive.google.com/file/d/{file_id}/preview"
+
+
+def thumbnail_url(file_id: str, size: str = "w400") -> str:
+    """Thumbnail URL for a file (size like 'w200', 'w400', 'w800')"""
+    return f"https://drive.google.com/thumbnail?id={file_id}&sz={size}"
+
+
+def drive_urls(file_id: str, thumbnail_size: str = "w400") -> dict:
+    """All public URLs for a file at once, for list serializers"""
+    return {
+        "download_url": direct_download_url(file_id),
+        "preview_url": preview_url(file_id),
+        "thumbnail_url": thumbnail_url(file_id, thumbnail_size),
+    }
+
+
+@lru_cache(maxsize=None)
+def _service_account_info(path: str) -> dict:
+    """Read and parse a service account key file once per process"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def _load_credentials(path: str, scopes: Tuple[str, ...]):
+    """Build service account credentials once per key file and scope set and reuse them"""
+    return service_account.Credentials.from_service_account_info(_service_account_info(path), scopes=list(scopes))
+
 
 class GoogleDriveManager:
     """Manager for Google Drive operations"""
     
     # Scopes for Drive API access
-    SCOPES = ['https://www.googleapis.com/auth/drive']
+    SCOPES = ('https://www.googleapis.com/auth/drive',)
+    # Files up to this size go up in one streamed request; larger ones in resumable chunks
+    # (a multiple of 256 KiB) so a dropped connection only costs one chunk
+    SINGLE_REQUEST_UPLOAD_LIMIT = 100 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE = 32 * 1024 * 1024
+    # Upload errors that fall back to a mock file: folder missing, no quota, or permission denied
+    MOCK_FALLBACK_STATUSES = frozenset({403, 404})
+    MOCK_FALLBACK_REASONS = frozenset({'notFound', 'storageQuotaExceeded', 'quotaExceeded'})
+    # Download chunk size, written to disk as each chunk arrives
+    DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+    # Folder -> shared drive ID (None for personal storage), shared by all instances
+    _drive_id_cache: dict = {}
     
     def __init__(self):
         """Initialize Google Drive manager with credentials"""
         self.service = None
+        self.credentials = None
+        # httplib2 connections are not thread-safe; uploads use one per worker thread
+        self._local = threading.local()
+        # Recently fetched file metadata, shared by request threads
+        self._info_cache = TTLCache(maxsize=4096, ttl=60)
+        self._info_lock = threading.Lock()
         self.mock_mode = False  # Flag to indicate if we're using mock data
         # When interacting with shared drives, pass this flag to Drive API calls
         self.supports_all_drives = True
-        self._drive_id_cache = {}  # Cache for folder -> drive_id lookups
         self._initialize_service()
     
     def _initialize_service(self):
-        """Initialize Google Drive service with credentials"""
+        """Initialize Google Drive service with credentials (no-op once built)"""
+        if self.service is not None:
+            return
         try:
             # Check if service account credentials are configured
             if settings.google_service_account_json:
                 # Check if file exists
                 if not os.path.exists(settings.google_service_account_json):
-                    print(f"[Google Drive] Credentials file not found at: {settings.google_service_account_json}")
-                    print("[Google Drive] Switching to mock mode for development")
+                    log.warning("Credentials file not found at %s, using mock mode", settings.google_service_account_json)
                     self.mock_mode = True
                     return
                 
-                credentials = service_account.Credentials.from_service_account_file(
-                    settings.google_service_account_json,
-                    scopes=self.SCOPES
+                self.credentials = _load_credentials(settings.google_service_account_json, self.SCOPES)
+                # Discovery document bundled with google-api-python-client, no network fetch
+                self.service = build(
+                    'drive', 'v3', credentials=self.credentials, cache_discovery=False, static_discovery=True
                 )
-                self.service = build('drive', 'v3', credentials=credentials)
-                print("[Google Drive] Successfully initialized with real credentials")
+                log.info("Initialized with service account credentials")
+                self._warm_drive_id_cache()
             else:
-                print("[Google Drive] No credentials configured, using mock mode for development")
+                log.warning("No credentials configured, using mock mode")
                 self.mock_mode = True
         except Exception as e:
-            print(f"[Google Drive] Error initializing: {str(e)}")
-            print("[Google Drive] Falling back to mock mode for development")
+            log.error("Error initializing, falling back to mock mode: %s", e)
             self.mock_mode = True
+
+    @staticmethod
+    def _error_reason(error: HttpError) -> str:
+        """First machine-readable reason code of a Drive error (e.g. 'notFound'), or ''"""
+        details = error.error_details
+        if isinstance(details, list) and details and isinstance(details[0], dict):
+            return details[0].get('reason', '')
+        return ''
+    
+    @classmethod
+    def _pick_chunksize(cls, size: Optional[int]) -> int:
+        """Upload chunk size for a file of the given size (-1 sends it in a single request)"""
+        if size is not None and size <= cls.SINGLE_REQUEST_UPLOAD_LIMIT:
+            return -1
+        return cls.UPLOAD_CHUNK_SIZE
+    
+    def _thread_http(self) -> google_auth_httplib2.AuthorizedHttp:
+        """Get this thread's authorized HTTP connection, kept alive between requests"""
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = google_auth_httplib2.AuthorizedHttp(self.credentials, http=httplib2.Http())
+            self._local.http = http
+        return http
+
+    @_retry
+    def _execute(self, request) -> dict:
+        """Execute a Drive API request over this thread's connection"""
+        return request.execute(http=self._thread_http())
+    
+    @staticmethod
+    @_retry
+    def _next_download_chunk(downloader: MediaIoBaseDownload) -> bool:
+        """Fetch the next download chunk; a retry resumes from the last completed chunk"""
+        _status, done = downloader.next_chunk()
+        return done
+    
+    @_retry
+    def _execute_upload(self, request) -> dict:
+        """Send a resumable upload chunk by chunk over the same connection (a retry resumes the session)"""
+        http = self._thread_http()
+        response = None
+        while response is None:
+            _status, response = request.next_chunk(http=http)
+        return response
+    
+    def _warm_drive_id_cache(self) -> None:
+        """Look up the shared drives of the configured upload folders in one batch request"""
+        folder_ids = {
+            settings.google_drive_papers_folder_id,
+            settings.google_drive_textbooks_folder_id,
+            settings.google_drive_notes_folder_id,
+        }
+        folder_ids = [f for f in folder_ids if f and f.strip() and f not in self._drive_id_cache]
+        if not folder_ids:
+            return
+        
+        def _on_done(folder_id, response, exception):
+            if exception is None:
+                self._drive_id_cache[folder_id] = response.get('driveId')
+        
+        batch = self.service.new_batch_http_request(callback=_on_done)
+        for folder_id in folder_ids:
+            batch.add(
+                self.service.files().get(
+                    fileId=folder_id,
+                    fields='driveId',
+                    supportsAllDrives=self.supports_all_drives
+                ),
+                request_id=folder_id,
+            )
+        try:
+            batch.execute(http=self._thread_http())
+        except Exception as e:
+            # Lookups fall back to one request per folder on first upload
+            log.warning("Failed to warm shared drive cache: %s", e)
     
     def _get_shared_drive_id(self, folder_id: str) -> Optional[str]:
         """
@@ -74,18 +256,18 @@ class GoogleDriveManager:
                 fileId=folder_id,
                 fields='driveId',
                 supportsAllDrives=self.supports_all_drives
-            ).execute()
+            ).execute(http=self._thread_http())
             
             drive_id = file_info.get('driveId')
+            self._drive_id_cache[folder_id] = drive_id
             if drive_id:
-                print(f"[Google Drive] Folder {folder_id} is on Shared Drive: {drive_id}")
-                self._drive_id_cache[folder_id] = drive_id
+                log.debug("Folder %s is on Shared Drive %s", folder_id, drive_id)
                 return drive_id
             else:
-                print(f"[Google Drive] Folder {folder_id} is not on a Shared Drive (personal storage)")
+                log.debug("Folder %s is not on a Shared Drive (personal storage)", folder_id)
                 return None
         except Exception as e:
-            print(f"[Google Drive] Failed to get drive ID for folder {folder_id}: {str(e)}")
+            log.warning("Failed to get drive ID for folder %s: %s", folder_id, e)
             return None
     
     def upload_file(
@@ -116,7 +298,7 @@ class GoogleDriveManager:
         if self.mock_mode:
             file_id = str(uuid.uuid4())
             shareable_link = f"https://drive.google.com/file/d/{file_id}/view"
-            print(f"[Google Drive Mock] Generated mock file ID: {file_id} for {filename}")
+            log.info("Mock mode: generated file ID %s for %s", file_id, filename)
             return (file_id, shareable_link)
         
         try:
@@ -131,25 +313,29 @@ class GoogleDriveManager:
                 # Get the shared drive ID for this folder
                 drive_id = self._get_shared_drive_id(folder_id)
             
-            media = MediaFileUpload(file_path, mimetype=mime_type, resumable=True)
+            media = MediaFileUpload(
+                file_path, mimetype=mime_type, chunksize=self._pick_chunksize(os.path.getsize(file_path)),
+                resumable=True
+            )
             
             if drive_id:
                 # For shared drives, use corpora parameter
-                file = self.service.files().create(
+                request = self.service.files().create(
                     body=file_metadata,
                     media_body=media,
                     fields='id, webViewLink, webContentLink',
                     supportsAllDrives=self.supports_all_drives,
                     corpora='drive',
                     driveId=drive_id
-                ).execute()
+                )
             else:
-                file = self.service.files().create(
+                request = self.service.files().create(
                     body=file_metadata,
                     media_body=media,
                     fields='id, webViewLink, webContentLink',
                     supportsAllDrives=self.supports_all_drives,
-                ).execute()
+                )
+            file = self._execute_upload(request)
             
             file_id = file.get('id')
             shareable_link = file.get('webViewLink', file.get('webContentLink'))
@@ -160,14 +346,12 @@ class GoogleDriveManager:
             return file_id, shareable_link
         
         except HttpError as error:
-            error_msg = str(error)
             # If folder not found, fall back to mock mode
-            if '404' in error_msg or 'File not found' in error_msg or 'notFound' in error_msg:
-                print(f"[Google Drive] Folder not found or not accessible: {folder_id}")
-                print("[Google Drive] Switching to mock mode for this upload")
+            if error.resp.status == 404 or self._error_reason(error) == 'notFound':
+                log.warning("Folder %s not found or not accessible, using a mock file ID for this upload", folder_id)
                 file_id = str(uuid.uuid4())
                 shareable_link = f"https://drive.google.com/file/d/{file_id}/view"
-                print(f"[Google Drive Mock] Generated mock file ID: {file_id} for {filename}")
+                log.info("Mock mode: generated file ID %s for %s", file_id, filename)
                 return (file_id, shareable_link)
             else:
                 raise Exception(f"Failed to upload file to Google Drive: {error}")
@@ -178,7 +362,8 @@ class GoogleDriveManager:
         filename: str,
         mime_type: str,
         folder_id: Optional[str] = None,
-        description: Optional[str] = None
+        description: Optional[str] = None,
+        share: bool = True
     ) -> Tuple[str, str]:
         """
         Upload file from bytes to Google Drive
@@ -189,6 +374,39 @@ class GoogleDriveManager:
             mime_type: MIME type of the file
             folder_id: Optional folder ID to upload to
             description: Optional file description
+            share: Make the file readable by anyone with the link (False when the caller batches sharing)
+        
+        Returns:
+            Tuple of (file_id, shareable_link)
+        
+        Raises:
+            Exception: If upload fails
+        """
+        return self.upload_file_from_stream(
+            io.BytesIO(file_bytes), filename, mime_type, folder_id, description, share, size=len(file_bytes)
+        )
+    
+    def upload_file_from_stream(
+        self,
+        file_stream: BinaryIO,
+        filename: str,
+        mime_type: str,
+        folder_id: Optional[str] = None,
+        description: Optional[str] = None,
+        share: bool = True,
+        size: Optional[int] = None
+    ) -> Tuple[str, str]:
+        """
+        Upload a seekable binary stream to Google Drive, reading one chunk at a time
+        
+        Args:
+            file_stream: Readable, seekable file object positioned at the start of the content
+            filename: Name of the file in Google Drive
+            mime_type: MIME type of the file
+            folder_id: Optional folder ID to upload to
+            description: Optional file description
+            share: Make the file readable by anyone with the link (False when the caller batches sharing)
+            size: Content length in bytes, if known (for logging)
         
         Returns:
             Tuple of (file_id, shareable_link)
@@ -200,14 +418,11 @@ class GoogleDriveManager:
         if self.mock_mode:
             file_id = str(uuid.uuid4())
             shareable_link = f"https://drive.google.com/file/d/{file_id}/view"
-            print(f"[Google Drive Mock] Generated mock file ID: {file_id} for {filename}")
+            log.info("Mock mode: generated file ID %s for %s", file_id, filename)
             return (file_id, shareable_link)
         
         try:
-            print(f"[Google Drive] Uploading file: {filename}")
-            print(f"[Google Drive] File size: {len(file_bytes)} bytes")
-            print(f"[Google Drive] MIME type: {mime_type}")
-            print(f"[Google Drive] Folder ID: {folder_id}")
+            log.debug("Uploading %s (%s bytes, %s) to folder %s", filename, size, mime_type, folder_id)
             
             file_metadata = {
                 'name': filename,
@@ -217,66 +432,84 @@ class GoogleDriveManager:
             drive_id = None
             if folder_id:
                 file_metadata['parents'] = [folder_id]
-                print(f"[Google Drive] Using parent folder: {folder_id}")
                 # Get the shared drive ID for this folder
                 drive_id = self._get_shared_drive_id(folder_id)
                 if drive_id:
-                    print(f"[Google Drive] Will upload to Shared Drive: {drive_id}")
+                    log.debug("Will upload to Shared Drive %s", drive_id)
             else:
-                print(f"[Google Drive] Uploading to root directory (no parent folder)")
+                log.debug("Uploading to root directory (no parent folder)")
             
-            file_stream = io.BytesIO(file_bytes)
-            media = MediaIoBaseUpload(file_stream, mimetype=mime_type, resumable=True)
+            media = MediaIoBaseUpload(
+                file_stream, mimetype=mime_type, chunksize=self._pick_chunksize(size), resumable=True
+            )
             
-            print(f"[Google Drive] Starting file upload...")
             # Build create request with corpora parameter for shared drives
             if drive_id:
                 # For shared drives, use the corpora parameter to target the specific drive
-                file = self.service.files().create(
+                request = self.service.files().create(
                     body=file_metadata,
                     media_body=media,
                     fields='id, webViewLink, webContentLink',
                     supportsAllDrives=self.supports_all_drives,
                     corpora='drive',
                     driveId=drive_id
-                ).execute()
+                )
             else:
-                file = self.service.files().create(
+                request = self.service.files().create(
                     body=file_metadata,
                     media_body=media,
                     fields='id, webViewLink, webContentLink',
                     supportsAllDrives=self.supports_all_drives,
-                ).execute()
+                )
+            file = self._execute_upload(request)
             
             file_id = file.get('id')
             shareable_link = file.get('webViewLink', file.get('webContentLink'))
             
-            print(f"[Google Drive] File uploaded successfully! ID: {file_id}")
-            print(f"[Google Drive] Shareable link: {shareable_link}")
+            log.debug("Uploaded %s as %s: %s", filename, file_id, shareable_link)
             
             # Make file accessible to anyone with link
-            self._share_file(file_id, drive_id)
+            if share:
+                self._share_file(file_id, drive_id)
             
             return file_id, shareable_link
         
         except HttpError as error:
-            error_msg = str(error)
-            print(f"[Google Drive] HttpError occurred: {error_msg}")
+            status = error.resp.status
+            reason = self._error_reason(error)
             # If folder not found or storage quota exceeded, fall back to mock mode
-            if ('404' in error_msg or 'File not found' in error_msg or 'notFound' in error_msg or
-                '403' in error_msg or 'storageQuotaExceeded' in error_msg or 'Service Accounts do not have storage quota' in error_msg):
-                print(f"[Google Drive] Cannot upload to Google Drive (folder not found, no storage quota, or permission denied)")
-                print("[Google Drive] ⚠️  IMPORTANT: Service accounts can only upload to Shared Drives, not personal Drive")
-                print("[Google Drive] ℹ️  See FIX_GOOGLE_DRIVE_UPLOADS.md for setup instructions")
-                print("[Google Drive] Switching to mock mode for this upload")
+            if status in self.MOCK_FALLBACK_STATUSES or reason in self.MOCK_FALLBACK_REASONS:
+                log.warning(
+                    "Cannot upload to Google Drive (HTTP %s %s: folder not found, no storage quota or permission denied); "
+                    "service accounts can only upload to Shared Drives, see FIX_GOOGLE_DRIVE_UPLOADS.md. "
+                    "Using a mock file ID for this upload",
+                    status, reason
+                )
                 file_id = str(uuid.uuid4())
                 shareable_link = f"https://drive.google.com/file/d/{file_id}/view"
-                print(f"[Google Drive Mock] Generated mock file ID: {file_id} for {filename}")
+                log.info("Mock mode: generated file ID %s for %s", file_id, filename)
                 return (file_id, shareable_link)
             else:
-                print(f"[Google Drive] Unexpected error, re-raising exception")
                 raise Exception(f"Failed to upload file to Google Drive: {error}")
     
+    def upload_files_from_bytes(self, items: Iterable[dict]) -> List[Tuple[str, str]]:
+        """
+        Upload several related files and share them with one batched request
+        
+        Args:
+            items: Keyword arguments for upload_file_from_bytes, one dict per file
+        
+        Returns:
+            List of (file_id, shareable_link) tuples in input order
+        
+        Raises:
+            Exception: If any upload fails
+        """
+        results = [self.upload_file_from_bytes(**item, share=False) for item in items]
+        if not self.mock_mode:
+            self._share_files([file_id for file_id, _ in results])
+        return results
+    
     def download_file(self, file_id: str, output_path: str) -> bool:
         """
         Download a file from Google Drive
@@ -293,9 +526,13 @@ class GoogleDriveManager:
         """
         try:
             request = self.service.files().get_media(fileId=file_id)
+            request.http = self._thread_http()
             
             with open(output_path, 'wb') as f:
-                f.write(request.execute())
+                downloader = MediaIoBaseDownload(f, request, chunksize=self.DOWNLOAD_CHUNK_SIZE)
+                done = False
+                while not done:
+                    done = self._next_download_chunk(downloader)
             
             return True
         
@@ -316,15 +553,20 @@ class GoogleDriveManager:
             Exception: If deletion fails
         """
         try:
-            self.service.files().delete(fileId=file_id).execute()
+            self.service.files().delete(fileId=file_id).execute(http=self._thread_http())
+            self.invalidate_file_info(file_id)
             return True
         
         except HttpError as error:
             raise Exception(f"Failed to delete file from Google Drive: {error}")
     
+    async def delete_file_async(self, file_id: str) -> bool:
+        """Delete a file from Google Drive without blocking the event loop"""
+        return await _run_in_drive_executor(self.delete_file, file_id)
+    
     def get_file_info(self, file_id: str) -> dict:
         """
-        Get information about a file
+        Get information about a file (cached for 60 seconds)
         
         Args:
             file_id: Google Drive file ID
@@ -335,17 +577,29 @@ class GoogleDriveManager:
         Raises:
             Exception: If retrieval fails
         """
+        with self._info_lock:
+            file = self._info_cache.get(file_id)
+        if file is not None:
+            return file
+        
         try:
-            file = self.service.files().get(
+            file = self._execute(self.service.files().get(
                 fileId=file_id,
                 fields='id, name, size, mimeType, webViewLink, webContentLink, createdTime, modifiedTime'
-            ).execute()
+            ))
             
+            with self._info_lock:
+                self._info_cache[file_id] = file
             return file
         
         except HttpError as error:
             raise Exception(f"Failed to get file info from Google Drive: {error}")
     
+    def invalidate_file_info(self, file_id: str) -> None:
+        """Drop cached metadata for a file that was changed or deleted"""
+        with self._info_lock:
+            self._info_cache.pop(file_id, None)
+    
     def _share_file(self, file_id: str, drive_id: Optional[str] = None) -> None:
         """
         Make a file accessible to anyone with the link
@@ -367,18 +621,48 @@ class GoogleDriveManager:
                     body=permission,
                     fields='id',
                     supportsAllDrives=self.supports_all_drives,
-                ).execute()
+                ).execute(http=self._thread_http())
             else:
                 self.service.permissions().create(
                     fileId=file_id,
                     body=permission,
                     fields='id',
                     supportsAllDrives=self.supports_all_drives,
-                ).execute()
+                ).execute(http=self._thread_http())
         
         except HttpError as error:
             # If sharing fails, continue anyway (file might already be shared)
-            print(f"[Google Drive] Warning: Failed to share file {file_id}: {str(error)}")
+            log.warning("Failed to share file %s: %s", file_id, error)
+    
+    def _share_files(self, file_ids: List[str]) -> None:
+        """
+        Make several files accessible to anyone with the link in one batch request
+        
+        Args:
+            file_ids: Google Drive file IDs
+        """
+        if not file_ids:
+            return
+        
+        def _on_done(request_id, response, exception):
+            if exception is not None:
+                log.warning("Failed to share file %s: %s", request_id, exception)
+        
+        batch = self.service.new_batch_http_request(callback=_on_done)
+        for file_id in file_ids:
+            batch.add(
+                self.service.permissions().create(
+                    fileId=file_id,
+                    body={'type': 'anyone', 'role': 'reader'},
+                    fields='id',
+                    supportsAllDrives=self.supports_all_drives,
+                ),
+                request_id=file_id,
+            )
+        try:
+            batch.execute(http=self._thread_http())
+        except HttpError as error:
+            log.warning("Failed to share files %s: %s", file_ids, error)
     
     def create_folder(self, folder_name: str, parent_folder_id: Optional[str] = None) -> str:
         """
@@ -407,20 +691,28 @@ class GoogleDriveManager:
                 body=file_metadata,
                 fields='id',
                 supportsAllDrives=self.supports_all_drives,
-            ).execute()
+            ).execute(http=self._thread_http())
             
             return folder.get('id')
         
         except HttpError as error:
             raise Exception(f"Failed to create folder in Google Drive: {error}")
     
-    def list_files_in_folder(self, folder_id: str, query: Optional[str] = None) -> list:
+    def list_files_in_folder(
+        self,
+        folder_id: str,
+        query: Optional[str] = None,
+        fields: str = 'files(id, name)',
+        page_size: int = 1000
+    ) -> list:
         """
-        List files in a Google Drive folder
+        List all files in a Google Drive folder, following every result page
         
         Args:
             folder_id: Google Drive folder ID
             query: Optional additional query filter
+            fields: Partial response mask for the files (e.g. 'files(id, name, size)')
+            page_size: Files per page (the API caps this at 1000)
         
         Returns:
             List of files
@@ -433,19 +725,35 @@ class GoogleDriveManager:
             if query:
                 q += f" and {query}"
             
-            results = self.service.files().list(
-                q=q,
-                spaces='drive',
-                fields='files(id, name, mimeType, size, createdTime, modifiedTime)',
-                pageSize=100,
-                supportsAllDrives=self.supports_all_drives,
-            ).execute()
-            
-            return results.get('files', [])
+            files = []
+            page_token = None
+            while True:
+                results = self.service.files().list(
+                    q=q,
+                    spaces='drive',
+                    fields=f'nextPageToken, {fields}',
+                    pageSize=page_size,
+                    pageToken=page_token,
+                    supportsAllDrives=self.supports_all_drives,
+                    includeItemsFromAllDrives=self.supports_all_drives,
+                ).execute(http=self._thread_http())
+                files.extend(results.get('files', []))
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    return files
         
         except HttpError as error:
             raise Exception(f"Failed to list files from Google Drive: {error}")
     
+    async def list_files_in_folder_async(self, folder_id: str, **kwargs) -> list:
+        """List files in a folder from a worker thread so the event loop keeps serving requests"""
+        return await _run_in_drive_executor(self.list_files_in_folder, folder_id, **kwargs)
+    
+    # Public link helpers; pure string formatting, no API calls
+    get_direct_download_url = staticmethod(direct_download_url)
+    get_preview_url = staticmethod(preview_url)
+    get_thumbnail_url = staticmethod(thumbnail_url)
+    
     async def upload_file_from_upload(
         self,
         file,
@@ -470,22 +778,23 @@ class GoogleDriveManager:
         Raises:
             Exception: If upload fails
         """
-        # Read file content into memory
-        file_content = await file.read()
-        
-        # Use the bytes upload method
-        return self.upload_file_from_bytes(
-            file_bytes=file_content,
+        # Stream the spooled temp file behind the UploadFile instead of reading it into memory
+        await file.seek(0)
+        return await _run_in_drive_executor(
+            self.upload_file_from_stream,
+            file.file,
             filename=filename,
             mime_type=mime_type,
             folder_id=folder_id,
-            description=description
+            description=description,
+            size=file.size
         )
 
 
 # Global Google Drive manager instance
+@lru_cache(maxsize=1)
 def get_drive_manager() -> GoogleDriveManager:
-    """Get or create Google Drive manager instance"""
+    """Get the process-wide Google Drive manager (built on first use)"""
     try:
         return GoogleDriveManager()
     except Exception as e:
@@ -4,37 +4,57 @@ Supports file uploads, downloads, and previews directly from your personal Drive
 """
 import os
 import io
+import logging
 import uuid
-import pickle
+import threading
 from typing import Optional, Tuple
+from cachetools import TTLCache
 from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload
+from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload, MediaIoBaseUpload
 from googleapiclient.errors import HttpError
 from ..core.config import settings
 
+log = logging.getLogger("ol_poddo.drive.oauth")
+
 
 class GoogleDriveOAuthManager:
     """Manager for Google Drive operations using OAuth2 with personal account"""
     
     # Only need drive.file scope - can only access files we create or are shared with
     SCOPES = ['https://www.googleapis.com/auth/drive.file']
-    TOKEN_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "token.pickle")
+    TOKEN_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "token.json")
+    # Download chunk size, written to disk as each chunk arrives (the library default is 100 MB)
+    DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
     
     def __init__(self):
         """Initialize Google Drive manager with OAuth2 credentials"""
         self.service = None
         self.mock_mode = False
-        self._initialize_service()
+        # Recently fetched file metadata, shared by request threads
+        self._info_cache = TTLCache(maxsize=4096, ttl=60)
+        self._info_lock = threading.Lock()
+        # The OAuth token load and service build wait for the first Drive call (see _ensure)
+        self._initialized = False
+        self._init_lock = threading.Lock()
+    
+    def _ensure(self):
+        """Initialize the Drive service on first use"""
+        if self._initialized:
+            return
+        with self._init_lock:
+            if not self._initialized:
+                self._initialize_service()
+                self._initialized = True
     
     def _initialize_service(self):
         """Initialize Google Drive service with OAuth2 credentials"""
         try:
             # Check if credentials JSON exists
             if not settings.google_oauth_credentials_json or not os.path.exists(settings.google_oauth_credentials_json):
-                print(f"[Google Drive OAuth] Credentials file not found at: {settings.google_oauth_credentials_json}")
-                print("[Google Drive OAuth] Switching to mock mode for development")
+                log.warning("Credentials file not found at %s, using mock mode", settings.google_oauth_credentials_json)
                 self.mock_mode = True
                 return
             
@@ -42,17 +62,16 @@ class GoogleDriveOAuthManager:
             
             # Load existing token if it exists
             if os.path.exists(self.TOKEN_PATH):
-                with open(self.TOKEN_PATH, 'rb') as token:
-                    creds = pickle.load(token)
-                    print("[Google Drive OAuth] Loaded existing token from cache")
+                creds = Credentials.from_authorized_user_file(self.TOKEN_PATH, self.SCOPES)
+                log.debug("Loaded existing token from cache")
             
             # If no valid token, request new one
             if not creds or not creds.valid:
                 if creds and creds.expired and creds.refresh_token:
-                    print("[Google Drive OAuth] Token expired, refreshing...")
+                    log.info("Token expired, refreshing")
                     creds.refresh(Request())
                 else:
-                    print("[Google Drive OAuth] Requesting new OAuth2 token (browser will open)...")
+                    log.warning("Requesting new OAuth2 token (browser will open)")
                     flow = InstalledAppFlow.from_client_secrets_file(
                         settings.google_oauth_credentials_json, 
                         self.SCOPES
@@ -62,16 +81,16 @@ class GoogleDriveOAuthManager:
                     creds = flow.run_local_server(port=0, open_browser=True)
                 
                 # Save the token for next time
-                with open(self.TOKEN_PATH, 'wb') as token:
-                    pickle.dump(creds, token)
-                    print(f"[Google Drive OAuth] Token saved to {self.TOKEN_PATH}")
+                with open(self.TOKEN_PATH, 'w', encoding='utf-8') as token:
+                    token.write(creds.to_json())
+                    log.info("Token saved to %s", self.TOKEN_PATH)
             
-            self.service = build('drive', 'v3', credentials=creds)
-            print("[Google Drive OAuth] Successfully initialized with personal account")
+            # Discovery document bundled with google-api-python-client, no network fetch
+            self.service = build('drive', 'v3', credentials=creds, cache_discovery=False, static_discovery=True)
+            log.info("Initialized with personal account")
             
         except Exception as e:
-            print(f"[Google Drive OAuth] Error initializing: {str(e)}")
-            print("[Google Drive OAuth] Falling back to mock mode for development")
+            log.error("Error initializing, falling back to mock mode: %s", e)
             self.mock_mode = True
     
     def upload_file(
@@ -98,10 +117,11 @@ class GoogleDriveOAuthManager:
         Raises:
             Exception: If upload fails
         """
+        self._ensure()
         if self.mock_mode:
             file_id = str(uuid.uuid4())
             shareable_link = f"https://drive.google.com/file/d/{file_id}/view"
-            print(f"[Google Drive Mock] Generated mock file ID: {file_id} for {filename}")
+            log.info("Mock mode: generated file ID %s for %s", file_id, filename)
             return (file_id, shareable_link)
         
         try:
@@ -125,11 +145,11 @@ class GoogleDriveOAuthManager:
             file_id = file.get('id')
             shareable_link = file.get('webViewLink')
             
-            print(f"[Google Drive OAuth] Successfully uploaded: {filename} (ID: {file_id})")
+            log.debug("Uploaded %s (ID: %s)", filename, file_id)
             return (file_id, shareable_link)
             
         except HttpError as error:
-            print(f'[Google Drive OAuth] Upload error: {error}')
+            log.error("Upload error: %s", error)
             raise
     
     async def upload_file_from_upload(
@@ -153,10 +173,11 @@ class GoogleDriveOAuthManager:
         Returns:
             Tuple of (file_id, shareable_link)
         """
+        self._ensure()
         if self.mock_mode:
             file_id = str(uuid.uuid4())
             shareable_link = f"https://drive.google.com/file/d/{file_id}/view"
-            print(f"[Google Drive Mock] Generated mock file ID: {file_id} for {filename}")
+            log.info("Mock mode: generated file ID %s for %s", file_id, filename)
             return (file_id, shareable_link)
         
         try:
@@ -188,11 +209,11 @@ class GoogleDriveOAuthManager:
             file_id = file_result.get('id')
             shareable_link = file_result.get('webViewLink')
             
-            print(f"[Google Drive OAuth] Successfully uploaded: {filename} (ID: {file_id})")
+            log.debug("Uploaded %s (ID: %s)", filename, file_id)
             return (file_id, shareable_link)
             
         except HttpError as error:
-            print(f'[Google Drive OAuth] Upload error: {error}')
+            log.error("Upload error: %s", error)
             raise
     
     def download_file(
@@ -210,28 +231,29 @@ class GoogleDriveOAuthManager:
         Returns:
             True if successful, False otherwise
         """
+        self._ensure()
         if self.mock_mode:
-            print(f"[Google Drive Mock] Would download file {file_id} to {output_path}")
+            log.info("Mock mode: would download file %s to %s", file_id, output_path)
             return True
         
         try:
             request = self.service.files().get_media(fileId=file_id)
             with open(output_path, 'wb') as fh:
-                downloader = MediaIoBaseDownload(fh, request)
+                downloader = MediaIoBaseDownload(fh, request, chunksize=self.DOWNLOAD_CHUNK_SIZE)
                 done = False
                 while done is False:
                     status, done = downloader.next_chunk()
             
-            print(f"[Google Drive OAuth] Successfully downloaded file {file_id}")
+            log.debug("Downloaded file %s", file_id)
             return True
             
         except HttpError as error:
-            print(f'[Google Drive OAuth] Download error: {error}')
+            log.error("Download error: %s", error)
             return False
     
     def get_file_info(self, file_id: str) -> Optional[dict]:
         """
-        Get file metadata from Google Drive
+        Get file metadata from Google Drive (cached for 60 seconds)
         
         Args:
             file_id: The file ID
@@ -239,6 +261,7 @@ class GoogleDriveOAuthManager:
         Returns:
             File metadata dictionary or None
         """
+        self._ensure()
         if self.mock_mode:
             return {
                 'id': file_id,
@@ -246,18 +269,30 @@ class GoogleDriveOAuthManager:
                 'mimeType': 'application/pdf'
             }
         
+        with self._info_lock:
+            file = self._info_cache.get(file_id)
+        if file is not None:
+            return file
+        
         try:
             file = self.service.files().get(
                 fileId=file_id,
                 fields='id, name, mimeType, size, createdTime, modifiedTime, webViewLink',
                 supportsAllDrives=True
             ).execute()
+            with self._info_lock:
+                self._info_cache[file_id] = file
             return file
             
         except HttpError as error:
-            print(f'[Google Drive OAuth] Get file info error: {error}')
+            log.warning("Get file info error: %s", error)
             return None
     
+    def invalidate_file_info(self, file_id: str) -> None:
+        """Drop cached metadata for a file that was changed or deleted"""
+        with self._info_lock:
+            self._info_cache.pop(file_id, None)
+    
     def get_direct_download_url(self, file_id: str) -> str:
         """
         Returns clean direct download link (bypasses Google virus warning for most cases)
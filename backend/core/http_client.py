@@ -0,0 +1,28 @@
+"""
+Shared outbound HTTP client
+One httpx.AsyncClient per process so connections (and TLS sessions) to Google's OAuth
+endpoints are reused across requests; closed from the app lifespan on shutdown
+"""
+from typing import Optional
+
+import httpx
+
+HTTP_TIMEOUT = 10.0  # seconds, per request
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(timeout=HTTP_TIMEOUT)
+    return _client
+
+
+async def close_http_client():
+    """Close the shared client if it was ever created"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
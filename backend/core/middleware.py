@@ -0,0 +1,197 @@
+"""
+Pure ASGI middleware used by the API app
+Works directly on the ASGI scope so no Request/Response objects are built per request
+"""
+import logging
+import re
+from typing import Callable, Iterable, Mapping, Optional, Pattern
+
+from starlette.middleware.cors import CORSMiddleware
+
+log = logging.getLogger("ol_poddo")
+
+
+class HostCheckMiddleware:
+    """Reject requests whose Host header is not in the allowed list"""
+
+    def __init__(self, app, allowed_hosts: Iterable[str]):
+        self.app = app
+        patterns = []
+        for host in allowed_hosts:
+            if host.startswith("*."):
+                # "*.vercel.app" matches any single subdomain label
+                patterns.append(r"[^.]+" + re.escape(host[1:]))
+            else:
+                patterns.append(re.escape(host))
+        # One compiled alternation (optional port included) instead of a Python loop per request
+        self.host_re = re.compile(r"^(?:%s)(?::\d+)?$" % "|".join(patterns))
+
+    def is_allowed(self, host: str) -> bool:
+        """Check a raw Host header value (port included) against the allowed hosts"""
+        return self.host_re.match(host) is not None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        host = ""
+        for key, value in scope["headers"]:
+            if key == b"host":
+                host = value.decode("latin-1")
+                break
+
+        if self.is_allowed(host):
+            await self.app(scope, receive, send)
+            return
+
+        if scope["type"] == "websocket":
+            await send({"type": "websocket.close", "code": 1008})
+            return
+
+        body = b"Invalid host header"
+        await send({
+            "type": "http.response.start",
+            "status": 400,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class LazyRouterMiddleware:
+    """Import and include router modules on the first request that needs them"""
+
+    def __init__(self, app, prefix: str, segments: Mapping[str, Iterable[str]], load: Callable[[str], None]):
+        self.app = app
+        self.prefix = prefix
+        # First path segment under the prefix -> router modules still to load
+        self.pending = {segment: tuple(modules) for segment, modules in segments.items()}
+        self.load = load
+
+    async def __call__(self, scope, receive, send):
+        if self.pending and scope["type"] in ("http", "websocket"):
+            path = scope["path"]
+            if path.startswith(self.prefix):
+                segment = path[len(self.prefix):].split("/", 1)[0]
+                modules = self.pending.get(segment)
+                if modules:
+                    try:
+                        for name in modules:
+                            self.load(name)
+                    except Exception:
+                        # Keep the segment pending so the next request retries the import
+                        log.exception("Error loading routers %s for /%s", modules, segment)
+                        raise
+                    self.pending.pop(segment, None)
+
+        await self.app(scope, receive, send)
+
+
+class HealthCheckMiddleware:
+    """Answer the health check path directly, ahead of every other middleware and the router"""
+
+    def __init__(self, app, path: str, payload: bytes):
+        self.app = app
+        self.path = path
+        self.payload = payload
+        self.headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode("latin-1")),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] != self.path or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        await send({"type": "http.response.start", "status": 200, "headers": self.headers})
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else self.payload})
+
+
+class OriginSetCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware that checks origins with a frozenset lookup and one precompiled regex"""
+
+    def __init__(self, app, allow_origins_exact: frozenset, allow_origins_regex: Optional[Pattern] = None, **kwargs):
+        super().__init__(app, allow_origins=list(allow_origins_exact), **kwargs)
+        self.allow_origins_exact = allow_origins_exact
+        self.allow_origins_regex = allow_origins_regex
+
+    def is_allowed_origin(self, origin: str) -> bool:
+        if origin in self.allow_origins_exact:
+            return True
+        return self.allow_origins_regex is not None and self.allow_origins_regex.fullmatch(origin) is not None
+
+
+class FastPreflightMiddleware:
+    """Answer valid CORS preflights for allowed origins directly, before the CORS middleware and routing"""
+
+    # Always allowed by browsers, mirrored from Starlette's CORSMiddleware
+    SAFELISTED_HEADERS = ("Accept", "Accept-Language", "Content-Language", "Content-Type")
+
+    def __init__(
+        self,
+        app,
+        allow_origins_exact: frozenset,
+        allow_origins_regex: Optional[Pattern],
+        allow_methods: Iterable[str],
+        allow_headers: Iterable[str],
+        max_age: int,
+        allow_credentials: bool = True,
+    ):
+        self.app = app
+        self.allow_origins_exact = frozenset(origin.encode("latin-1") for origin in allow_origins_exact)
+        self.allow_origins_regex = allow_origins_regex
+        methods = list(allow_methods)
+        headers = sorted(set(allow_headers) | set(self.SAFELISTED_HEADERS))
+        self.allow_methods = frozenset(method.encode("latin-1") for method in methods)
+        self.allow_headers = frozenset(header.lower().encode("latin-1") for header in headers)
+        # Everything but the echoed origin is the same for every preflight
+        self.headers = [
+            (b"access-control-allow-methods", ", ".join(methods).encode("latin-1")),
+            (b"access-control-allow-headers", ", ".join(headers).encode("latin-1")),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+            (b"vary", b"Origin"),
+            (b"content-length", b"0"),
+        ]
+        if allow_credentials:
+            self.headers.append((b"access-control-allow-credentials", b"true"))
+
+    def is_allowed_origin(self, origin: bytes) -> bool:
+        if origin in self.allow_origins_exact:
+            return True
+        return self.allow_origins_regex is not None and self.allow_origins_regex.fullmatch(origin.decode("latin-1")) is not None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        origin = method = None
+        requested_headers = b""
+        for key, value in scope["headers"]:
+            if key == b"origin":
+                origin = value
+            elif key == b"access-control-request-method":
+                method = value
+            elif key == b"access-control-request-headers":
+                requested_headers = value.lower()
+
+        # Anything unusual falls through so CORSMiddleware can build the proper (error) response
+        if (
+            origin is None
+            or method not in self.allow_methods
+            or not self.is_allowed_origin(origin)
+            or any(h.strip() not in self.allow_headers for h in requested_headers.split(b",") if h.strip())
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        await send({
+            "type": "http.response.start",
+            "status": 204,
+            "headers": [(b"access-control-allow-origin", origin)] + self.headers,
+        })
+        await send({"type": "http.response.body", "body": b""})
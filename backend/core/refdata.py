@@ -0,0 +1,38 @@
+"""
+Read-through cache for the grade/subject reference tables
+
+Grades and subjects are seeded once and only change through the admin create
+endpoints, which call clear() after committing. The cache is per process, so
+other workers pick up new rows when they restart.
+"""
+from functools import lru_cache
+from typing import Dict
+
+from .database import SessionLocal
+
+
+@lru_cache(maxsize=1)
+def grade_by_name() -> Dict[str, int]:
+    """Map of grade name -> grade id"""
+    from ..models.grade import Grade
+
+    with SessionLocal() as db:
+        return {name: grade_id for name, grade_id in db.query(Grade.name, Grade.id)}
+
+
+@lru_cache(maxsize=1)
+def subject_by_grade_id() -> Dict[int, Dict[int, str]]:
+    """Map of grade id -> {subject id: subject name}, with an entry for every grade"""
+    from ..models.grade import Subject
+
+    subjects = {grade_id: {} for grade_id in grade_by_name().values()}
+    with SessionLocal() as db:
+        for subject_id, grade_id, name in db.query(Subject.id, Subject.grade_id, Subject.name):
+            subjects.setdefault(grade_id, {})[subject_id] = name
+    return subjects
+
+
+def clear():
+    """Drop the cached maps after grades or subjects change"""
+    grade_by_name.cache_clear()
+    subject_by_grade_id.cache_clear()
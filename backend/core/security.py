@@ -1,16 +1,54 @@
-from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from datetime import timedelta
+from typing import Optional, Tuple
+import jwt
+import orjson
+from cachetools import TTLCache
+from jwt import InvalidTokenError as JWTError
 from passlib.context import CryptContext
 from pydantic import BaseModel
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session, defer
+import anyio
 from .config import settings
-
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from .database import get_db
+
+# Password hashing: new hashes are argon2id (OWASP minimum parameters); existing bcrypt
+# hashes still verify and are rehashed on the next successful login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
+)
 security = HTTPBearer()
 
+# Hash of a random password, verified against when a login names no user so misses cost the same as
+# hits; computed at import so no request (including the first miss) pays for hashing it
+DUMMY_PASSWORD_HASH = pwd_context.hash(secrets.token_urlsafe(16))
+
+# Password hashing runs on its own worker threads, at most one per core: the KDFs are CPU-bound, so
+# more threads only add contention, and they no longer hold tokens from the shared threadpool that
+# sync endpoints and DB calls run on. Created on first use, inside the event loop.
+HASH_WORKERS = os.cpu_count() or 1
+_hash_limiter: Optional[anyio.CapacityLimiter] = None
+
+# Recently verified tokens (SHA-256 of the raw token -> (TokenData, exp)); an SPA sends the same
+# bearer token on every request, so this skips the signature check for a few seconds at a time.
+# Only the decoded claims are cached - the user row is still loaded (and is_active checked) per request.
+# JWT_CACHE_TTL=0 turns the cache off.
+_token_cache = TTLCache(maxsize=8192, ttl=settings.jwt_cache_ttl) if settings.jwt_cache_ttl > 0 else None
+_token_cache_lock = threading.Lock()
+
 
 class TokenData(BaseModel):
     """JWT Token payload"""
@@ -30,42 +68,85 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify password against hash; also return a replacement hash if the stored one is outdated"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """Hash password"""
     return pwd_context.hash(password)
 
 
+async def _run_hash(func, *args):
+    """Run a password hashing call on the dedicated hashing threads"""
+    global _hash_limiter
+    if _hash_limiter is None:
+        _hash_limiter = anyio.CapacityLimiter(HASH_WORKERS)
+    return await anyio.to_thread.run_sync(func, *args, limiter=_hash_limiter)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify password in a worker thread, for async handlers (hashing is tens of ms of CPU)"""
+    return await _run_hash(pwd_context.verify, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash password in a worker thread, for async handlers"""
+    return await _run_hash(pwd_context.hash, password)
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# HS256 signing with the constant header encoded once and a keyed HMAC copied per token,
+# instead of rebuilding both on every jwt.encode call. Other algorithms go through PyJWT.
+_JWT_HEADER_B64 = _b64url(orjson.dumps({"alg": "HS256", "typ": "JWT"}))
+_HS256_TEMPLATE = (
+    hmac.new(settings.secret_key.encode(), digestmod=hashlib.sha256) if settings.algorithm == "HS256" else None
+)
+
+
+def _encode_token(claims: dict) -> str:
+    """Sign a claims dict (exp as a Unix timestamp) into a compact JWT"""
+    if _HS256_TEMPLATE is None:
+        return jwt.encode(claims, settings.secret_key, algorithm=settings.algorithm)
+    signing_input = _JWT_HEADER_B64 + b"." + _b64url(orjson.dumps(claims))
+    mac = _HS256_TEMPLATE.copy()
+    mac.update(signing_input)
+    return (signing_input + b"." + _b64url(mac.digest())).decode("ascii")
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
-    to_encode = data.copy()
-    
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(
-            minutes=settings.access_token_expire_minutes
-        )
+    if expires_delta is None:
+        expires_delta = timedelta(minutes=settings.access_token_expire_minutes)
     
-    to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(
-        to_encode, settings.secret_key, algorithm=settings.algorithm
-    )
-    return encoded_jwt
+    to_encode = data.copy()
+    to_encode.update({"exp": int(time.time() + expires_delta.total_seconds()), "type": "access"})
+    return _encode_token(to_encode)
 
 
 def create_refresh_token(data: dict) -> str:
     """Create JWT refresh token"""
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=settings.refresh_token_expire_days)
-    to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(
-        to_encode, settings.secret_key, algorithm=settings.algorithm
-    )
-    return encoded_jwt
+    expires_in = timedelta(days=settings.refresh_token_expire_days).total_seconds()
+    to_encode.update({"exp": int(time.time() + expires_in), "type": "refresh"})
+    return _encode_token(to_encode)
 
 
 def verify_token(token: str, token_type: str = "access") -> Optional[TokenData]:
     """Verify and decode JWT token"""
+    key = hashlib.sha256(token.encode()).digest()
+    if _token_cache is not None:
+        with _token_cache_lock:
+            cached = _token_cache.get(key)
+        if cached is not None:
+            token_data, expires_at = cached
+            if expires_at > time.time():
+                return token_data if token_data.type == token_type else None
+    
     try:
         payload = jwt.decode(
             token, settings.secret_key, algorithms=[settings.algorithm]
@@ -73,17 +154,23 @@ def verify_token(token: str, token_type: str = "access") -> Optional[TokenData]:
         username: str = payload.get("sub")
         token_type_claim: str = payload.get("type")
         
-        if username is None or token_type_claim != token_type:
+        if username is None or token_type_claim is None:
             return None
         
-        return TokenData(sub=username, type=token_type_claim)
+        token_data = TokenData(sub=username, type=token_type_claim)
+        if _token_cache is not None:
+            with _token_cache_lock:
+                _token_cache[key] = (token_data, payload.get("exp", 0))
+        return token_data if token_type_claim == token_type else None
     except JWTError:
         return None
 
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """Get current user from JWT token"""
-    from .database import SessionLocal
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+):
+    """Get current user from JWT token (loaded in the request's own database session)"""
     from ..models.user import User
     
     token = credentials.credentials
@@ -96,21 +183,17 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    db = SessionLocal()
-    try:
-        user = db.query(User).filter(User.username == token_data.sub).first()
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        if not user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="User account is inactive"
-            )
-        return user
-    finally:
-        db.close()
-
+    # The password hash is never needed for authorization; it loads on access if a handler wants it
+    user = db.query(User).options(defer(User.hashed_password)).filter(User.username == token_data.sub).first()
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is inactive"
+        )
+    return user
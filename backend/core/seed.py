@@ -0,0 +1,91 @@
+"""
+Database bootstrap - schema creation and seed data (grades and subjects)
+Only imported from the app lifespan hook so it stays off the cold-start import path
+
+Run once by hand (e.g. before starting with RUN_SCHEMA_BOOTSTRAP=0):
+    python -m backend.core.seed
+"""
+import asyncio
+
+from sqlalchemy import func, select
+
+from . import refdata
+from .database import async_engine, Base, AsyncSessionLocal
+
+
+def _register_models():
+    """Import every model module so Base.metadata and the mappers know all tables"""
+    from .. import models  # noqa: F401
+
+
+async def seed_if_empty():
+    """Insert the default grades and subjects when the grades table is empty"""
+    from ..models.grade import Grade, Subject
+
+    async with AsyncSessionLocal() as db:
+        try:
+            existing_grades = (await db.execute(select(func.count(Grade.id)))).scalar_one()
+            if existing_grades == 0:
+                print("Initializing seed data...")
+
+                # Create grades
+                grades_data = [
+                    Grade(name="Grade 6", level=6, description="Grade 6"),
+                    Grade(name="Grade 7", level=7, description="Grade 7"),
+                    Grade(name="Grade 8", level=8, description="Grade 8"),
+                    Grade(name="Grade 9", level=9, description="Grade 9"),
+                    Grade(name="Grade 10", level=10, description="Grade 10"),
+                    Grade(name="Grade 11", level=11, description="Grade 11 (O-Level)"),
+                ]
+                db.add_all(grades_data)
+                await db.flush()  # Assigns grade ids without committing yet
+                grade_ids = {grade.name: grade.id for grade in grades_data}
+
+                # Create subjects for each grade
+                subjects_data = {
+                    "Grade 11": ["Mathematics", "English", "Science", "History", "Geography"],
+                    "Grade 10": ["Mathematics", "English", "Science", "History", "Geography"],
+                    "Grade 9": ["Mathematics", "English", "Science"],
+                }
+                db.add_all([
+                    Subject(name=subject_name, grade_id=grade_ids[grade_name])
+                    for grade_name, subject_names in subjects_data.items()
+                    for subject_name in subject_names
+                ])
+
+                await db.commit()
+                refdata.clear()
+                print("Seed data initialized successfully")
+            else:
+                print(f"Database already has {existing_grades} grades, skipping seed data")
+        except Exception as e:
+            await db.rollback()
+            print(f"Warning: Could not initialize seed data: {e}")
+
+
+async def bootstrap_database():
+    """Create database tables (only if they don't exist) and seed reference data"""
+    if async_engine is None:
+        print("Warning: Database engine not available, skipping schema bootstrap")
+        return
+
+    _register_models()
+    try:
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    except Exception as e:
+        print(f"Warning: Could not create database tables: {e}")
+        return
+
+    await seed_if_empty()
+
+
+async def _main():
+    await bootstrap_database()
+    # Close the pool so aiosqlite's worker threads don't keep the process alive
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
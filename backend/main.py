@@ -1,187 +1,239 @@
+import atexit
+import importlib
+import logging
+import queue
 import sys
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
-# Add the parent directory to sys.path so backend is recognized as a package
-sys.path.insert(0, str(Path(__file__).parent.parent))
-# Also add current directory as fallback for edge cases
-sys.path.insert(0, str(Path(__file__).parent))
-
-from fastapi import FastAPI, HTTPException, status
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
-
-try:
-    from backend.core.config import settings
-    from backend.core.database import engine, Base
-    from backend.routes import auth, users, resources, notes, forum, questions, documents, files
-    from backend.models.user import User
-    from backend.models.resource import Resource, ResourceCategory
-    from backend.models.note import Note, StudyMaterial
-    from backend.models.forum import ForumPost, ForumComment
-    from backend.models.question import Question, Answer
-    from backend.models.token import VerificationToken, PasswordResetToken
-    from backend.models.grade import Grade, Subject
-    from backend.models.document import Paper, Textbook, StudyNote
-except ModuleNotFoundError as e:
-    # Fallback for edge cases
-    try:
-        from core.config import settings
-        from core.database import engine, Base
-        from routes import auth, users, resources, notes, forum, questions, documents, files
-        from models.user import User
-        from models.resource import Resource, ResourceCategory
-        from models.note import Note, StudyMaterial
-        from models.forum import ForumPost, ForumComment
-        from models.question import Question, Answer
-        from models.token import VerificationToken, PasswordResetToken
-        from models.grade import Grade, Subject
-        from models.document import Paper, Textbook, StudyNote
-    except ModuleNotFoundError:
-        print(f"Import error: {e}")
-        raise
-
-# Create database tables (only if they don't exist)
-try:
-    Base.metadata.create_all(bind=engine)
-    
-    # Initialize seed data (grades and subjects)
-    try:
-        from backend.core.database import SessionLocal
-    except ModuleNotFoundError:
-        from core.database import SessionLocal
-    
-    db = SessionLocal()
-    try:
-        existing_grades = db.query(Grade).count()
-        if existing_grades == 0:
-            print("Initializing seed data...")
-            
-            # Create grades
-            grades_data = [
-                Grade(name="Grade 6", level=6, description="Grade 6"),
-                Grade(name="Grade 7", level=7, description="Grade 7"),
-                Grade(name="Grade 8", level=8, description="Grade 8"),
-                Grade(name="Grade 9", level=9, description="Grade 9"),
-                Grade(name="Grade 10", level=10, description="Grade 10"),
-                Grade(name="Grade 11", level=11, description="Grade 11 (O-Level)"),
-            ]
-            
-            for grade in grades_data:
-                db.add(grade)
-            db.commit()
-            
-            # Create subjects for each grade
-            subjects_data = [
-                {"grade_name": "Grade 11 (O-Level)", "subjects": ["Mathematics", "English", "Science", "History", "Geography"]},
-                {"grade_name": "Grade 10", "subjects": ["Mathematics", "English", "Science", "History", "Geography"]},
-                {"grade_name": "Grade 9", "subjects": ["Mathematics", "English", "Science"]},
-            ]
-            
-            for grade_info in subjects_data:
-                grade = db.query(Grade).filter(Grade.name == grade_info["grade_name"]).first()
-                if grade:
-                    for subject_name in grade_info["subjects"]:
-                        subject = Subject(name=subject_name, grade_id=grade.id)
-                        db.add(subject)
-            
-            db.commit()
-            print("Seed data initialized successfully")
-        else:
-            print(f"Database already has {existing_grades} grades, skipping seed data")
-    except Exception as e:
-        print(f"Warning: Could not initialize seed data: {e}")
-    finally:
-        db.close()
-except Exception as e:
-    print(f"Warning: Could not create database tables: {e}")
-
-# Initialize FastAPI app
-app = FastAPI(
-    title="OL-Poddo API",
-    description="Backend API for OL-Poddo - A learning platform for O-Level students",
-    version="1.0.0",
-    docs_url="/api/docs",
-    redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json",
-)
-
-# Middleware setup
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Trusted host middleware
-app.add_middleware(
-    TrustedHostMiddleware,
-    allowed_hosts=["localhost", "127.0.0.1", "*.localhost", "ol-poddo-backend.vercel.app", "*.vercel.app"],
-)
-
-
-# Health check endpoint
-@app.get("/api/health", tags=["health"])
-def health_check():
-    """Check API health status"""
-    return {
-        "status": "healthy",
-        "environment": settings.environment,
-        "version": "1.0.0",
-        "service": "OL-Poddo API"
+# Resolve the package root once: when run as a top-level module ("uvicorn main:app"), put the
+# project root on sys.path so "backend" is importable as a package (the routers rely on relative
+# imports). Imported as backend.main (e.g. from api/index.py) the path is already right.
+if not __package__:
+    PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+
+import orjson
+
+# FastAPI, the middleware and the router modules are imported by create_app (routers on demand,
+# see load_router), so "import backend.main" stays cheap until the app is first needed
+from backend.core.config import settings
+from backend import routes
+
+# Application loggers ("ol_poddo.*"): per-request detail in development, warnings and errors otherwise
+app_log = logging.getLogger("ol_poddo")
+if not app_log.handlers:
+    log_handler = logging.StreamHandler()
+    log_handler.setFormatter(logging.Formatter("[%(name)s] %(levelname)s: %(message)s"))
+    # Request threads only enqueue records; one background thread does the stdout writes
+    log_queue = queue.SimpleQueue()
+    log_listener = QueueListener(log_queue, log_handler)
+    log_listener.start()
+    atexit.register(log_listener.stop)
+    app_log.addHandler(QueueHandler(log_queue))
+    app_log.propagate = False
+app_log.setLevel(logging.DEBUG if settings.debug else logging.WARNING)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Create tables and seed data on startup instead of at import time"""
+    if settings.run_schema_bootstrap:
+        from backend.core.seed import bootstrap_database
+        await bootstrap_database()
+    from backend.core.email import start_email_workers, stop_email_workers
+    start_email_workers()
+    yield
+    await stop_email_workers()
+    # Only loaded once the Google OAuth callback has run
+    http_client = sys.modules.get("backend.core.http_client")
+    if http_client is not None:
+        await http_client.close_http_client()
+    # Close the async pool; aiosqlite connections run on worker threads that would keep the process alive
+    from backend.core.database import async_engine
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+# Router modules and their mount prefixes, in include order (earlier routers win on overlapping paths)
+ROUTERS = {
+    "auth": "/api/auth",
+    "users": "/api/users",
+    "resources": "/api/resources",
+    "notes": "/api/notes",
+    "forum": "/api/forum",
+    "questions": "/api/questions",
+    "documents": "/api",
+    "files": "/api/files",
+}
+
+# First path segment under /api/ -> router modules serving it
+ROUTER_SEGMENTS = {
+    "auth": ("auth",),
+    "users": ("users",),
+    "resources": ("resources",),
+    "notes": ("notes",),
+    "forum": ("forum",),
+    "questions": ("questions",),
+    "grades": ("documents",),
+    "subjects": ("documents",),
+    "papers": ("documents",),
+    "textbooks": ("documents",),
+    "study-notes": ("documents",),
+    "files": ("files",),
+    # The OpenAPI schema (and so /api/docs) needs every router
+    "openapi.json": tuple(ROUTERS),
+}
+
+# CORS settings
+CORS_METHODS = ("GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS")
+CORS_HEADERS = ("Authorization", "Content-Type", "X-Requested-With")  # Pinned so preflight headers are built once
+CORS_MAX_AGE = 86400  # Let browsers cache preflight responses for 24h
+
+# Static JSON bodies, encoded once at import instead of on every request
+HEALTH_PAYLOAD = orjson.dumps({
+    "status": "healthy",
+    "environment": settings.environment,
+    "version": "1.0.0",
+    "service": "OL-Poddo API"
+})
+ROOT_PAYLOAD = orjson.dumps({
+    "message": "Welcome to OL-Poddo API",
+    "description": "A comprehensive learning platform for O-Level students",
+    "docs": "/api/docs" if settings.api_docs else None,
+    "version": "1.0.0",
+    "endpoints": {
+        "health": "/api/health",
+        "auth": "/api/auth",
+        "users": "/api/users",
+        "resources": "/api/resources",
+        "notes": "/api/notes",
+        "forum": "/api/forum",
+        "questions": "/api/questions",
+        "documents": "/api/grades",
+        "files": "/api/files"
     }
+})
 
 
-# Include routers
-app.include_router(auth.router, prefix="/api/auth")
-app.include_router(users.router, prefix="/api/users")
-app.include_router(resources.router, prefix="/api/resources")
-app.include_router(notes.router, prefix="/api/notes")
-app.include_router(forum.router, prefix="/api/forum")
-app.include_router(questions.router, prefix="/api/questions")
-app.include_router(documents.router, prefix="/api")
-app.include_router(files.router, prefix="/api")
-
-
-# Root endpoint
-@app.get("/", tags=["root"])
-def root():
-    """Root endpoint with API information"""
-    return {
-        "message": "Welcome to OL-Poddo API",
-        "description": "A comprehensive learning platform for O-Level students",
-        "docs": "/api/docs",
-        "version": "1.0.0",
-        "endpoints": {
-            "health": "/api/health",
-            "auth": "/api/auth",
-            "users": "/api/users",
-            "resources": "/api/resources",
-            "notes": "/api/notes",
-            "forum": "/api/forum",
-            "questions": "/api/questions",
-            "documents": "/api/documents",
-            "files": "/api/files"
-        }
-    }
+@lru_cache(maxsize=64)
+def _error_body(detail) -> bytes:
+    """Encoded {"detail": ...} body; most raised details are a handful of constant strings"""
+    return orjson.dumps({"detail": detail})
+
 
+def create_app():
+    """Build the FastAPI app with its middleware stack, root route and error handler"""
+    from fastapi import FastAPI, HTTPException
+    from fastapi.responses import ORJSONResponse, Response
 
-# Error handlers
-@app.exception_handler(HTTPException)
-async def http_exception_handler(request, exc):
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={"detail": exc.detail},
+    from backend.core.middleware import (
+        FastPreflightMiddleware, HealthCheckMiddleware, HostCheckMiddleware, LazyRouterMiddleware,
+        OriginSetCORSMiddleware,
     )
 
+    app = FastAPI(
+        title="OL-Poddo API",
+        description="Backend API for OL-Poddo - A learning platform for O-Level students",
+        version="1.0.0",
+        # No schema routes (and so no OpenAPI build) unless docs are enabled
+        docs_url="/api/docs" if settings.api_docs else None,
+        redoc_url="/api/redoc" if settings.api_docs else None,
+        openapi_url="/api/openapi.json" if settings.api_docs else None,
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+    )
+
+    router_routes = {}
+
+    def load_router(name: str):
+        """Import a router module and include it, keeping routers in ROUTERS order"""
+        if name in router_routes:
+            return
+
+        module = importlib.import_module(f"{routes.__name__}.{name}")
+        loaded = {id(route) for included in router_routes.values() for route in included}
+        start = len(app.router.routes)
+        app.include_router(module.router, prefix=ROUTERS[name])
+        router_routes[name] = app.router.routes[start:]
+
+        # App-level routes first, then every loaded router in declared order
+        base = [route for route in app.router.routes[:start] if id(route) not in loaded]
+        app.router.routes[:] = base + [
+            route for router_name in ROUTERS for route in router_routes.get(router_name, ())
+        ]
+        app.openapi_schema = None
+
+    # Middleware setup
+    # Lazy router loading (innermost, so it runs after the host and CORS checks)
+    app.add_middleware(
+        LazyRouterMiddleware,
+        prefix="/api/",
+        segments=ROUTER_SEGMENTS,
+        load=load_router,
+    )
+
+    # CORS middleware
+    app.add_middleware(
+        OriginSetCORSMiddleware,
+        allow_origins_exact=settings.cors_origins_exact,
+        allow_origins_regex=settings.cors_origins_regex,
+        allow_credentials=True,
+        allow_methods=CORS_METHODS,
+        allow_headers=CORS_HEADERS,
+        max_age=CORS_MAX_AGE,
+    )
+
+    # Valid preflights from allowed origins are answered here, without reaching CORS or routing
+    app.add_middleware(
+        FastPreflightMiddleware,
+        allow_origins_exact=settings.cors_origins_exact,
+        allow_origins_regex=settings.cors_origins_regex,
+        allow_methods=CORS_METHODS,
+        allow_headers=CORS_HEADERS,
+        max_age=CORS_MAX_AGE,
+    )
+
+    # Trusted host middleware (skipped under ENVIRONMENT=test, where clients use arbitrary hosts)
+    if settings.environment != "test":
+        app.add_middleware(HostCheckMiddleware, allowed_hosts=settings.allowed_hosts)
+
+    # Health check (outermost, so load balancer probes skip the host/CORS checks and routing)
+    app.add_middleware(HealthCheckMiddleware, path="/api/health", payload=HEALTH_PAYLOAD)
+
+    # Root endpoint
+    @app.get("/", tags=["root"])
+    def root():
+        """Root endpoint with API information"""
+        return Response(ROOT_PAYLOAD, media_type="application/json")
+
+    # Error handlers
+    @app.exception_handler(HTTPException)
+    async def http_exception_handler(request, exc):
+        try:
+            body = _error_body(exc.detail)
+        except TypeError:  # Unhashable detail (dict/list)
+            body = orjson.dumps({"detail": exc.detail})
+        return Response(body, status_code=exc.status_code, media_type="application/json", headers=exc.headers)
+
+    return app
+
+
+def __getattr__(name):
+    """Build the module-level app on first access ("uvicorn backend.main:app", "from backend.main import app")"""
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
-        "app.main:app",
+        "backend.main:app",
         host="0.0.0.0",
         port=8000,
         reload=True,
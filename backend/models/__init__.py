@@ -1 +1,4 @@
 # Models package
+# Import every model module so relationship("ClassName") strings always resolve,
+# whichever router happens to be loaded first
+from . import user, resource, note, forum, question, token, grade, document  # noqa: F401
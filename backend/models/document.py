@@ -1,8 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text, Enum, Boolean
-from sqlalchemy.orm import relationship
+import reprlib
+from typing import Optional
+from sqlalchemy import Integer, String, DateTime, ForeignKey, Float, Text, Boolean, Index, func, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from enum import Enum as PyEnum
-from ..core.database import Base
+from ..core.database import Base, enum_check
 
 
 class PaperType(str, PyEnum):
@@ -24,84 +26,113 @@ class Medium(str, PyEnum):
 class Paper(Base):
     """Paper document model (Past papers, Provisional papers, School papers, Model papers, etc.)"""
     __tablename__ = "papers"
+    # Listing filters always narrow by grade and subject before type/medium
+    __table_args__ = (
+        Index("ix_papers_grade_subject_type", "grade_id", "subject_id", "paper_type"),
+        Index("ix_papers_grade_subject_medium", "grade_id", "subject_id", "medium"),
+        # Stored as plain strings so row loads skip Enum coercion; the CHECKs keep values valid
+        enum_check("paper_type", PaperType),
+        enum_check("medium", Medium),
+        # Newest-first public listing: only public rows are indexed
+        Index(
+            "ix_papers_public_created", "created_at",
+            postgresql_where=text("is_public"), sqlite_where=text("is_public = 1"),
+        ),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    grade_id = Column(Integer, ForeignKey("grades.id"), nullable=False, index=True)
-    subject_id = Column(Integer, ForeignKey("subjects.id"), nullable=False, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    owner_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    grade_id: Mapped[int] = mapped_column(Integer, ForeignKey("grades.id", ondelete="CASCADE"), nullable=False, index=True)
+    subject_id: Mapped[int] = mapped_column(Integer, ForeignKey("subjects.id", ondelete="CASCADE"), nullable=False, index=True)
     
-    title = Column(String(255), nullable=False)
-    description = Column(Text, nullable=True)
-    paper_type = Column(Enum(PaperType), nullable=False, index=True)
-    medium = Column(Enum(Medium), nullable=True, index=True)  # Language: Sinhala, English, Tamil
-    exam_year = Column(Integer, nullable=True)  # e.g., 2023, 2024
-    google_drive_id = Column(String(255), nullable=False)  # Google Drive file ID
-    google_drive_url = Column(String(500), nullable=True)  # Shareable Google Drive URL
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    paper_type: Mapped[str] = mapped_column(String(32), nullable=False, index=True)  # PaperType value
+    medium: Mapped[Optional[str]] = mapped_column(String(16), nullable=True, index=True)  # Medium value: sinhala, english, tamil
+    exam_year: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # e.g., 2023, 2024
+    google_drive_id: Mapped[str] = mapped_column(String(64), nullable=False)  # Google Drive file ID (up to 44 chars)
+    google_drive_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)  # Shareable Google Drive URL
     
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    is_public = Column(Boolean, default=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), index=True)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
+    is_public: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
     
     # Relationships
-    owner = relationship("User", foreign_keys=[owner_id], back_populates="papers")
-    grade = relationship("Grade", back_populates="papers")
-    subject = relationship("Subject", back_populates="papers")
+    owner: Mapped["User"] = relationship("User", foreign_keys=[owner_id], back_populates="papers")
+    grade: Mapped["Grade"] = relationship("Grade", back_populates="papers")
+    subject: Mapped["Subject"] = relationship("Subject", back_populates="papers")
     
     def __repr__(self):
-        return f"<Paper(id={self.id}, title={self.title}, paper_type={self.paper_type})>"
+        return f"<Paper(id={self.id}, title={reprlib.repr(self.title)}, paper_type={self.paper_type})>"
 
 
 class Textbook(Base):
     """Textbook document model"""
     __tablename__ = "textbooks"
+    __table_args__ = (
+        Index("ix_textbooks_grade_subject_medium", "grade_id", "subject_id", "medium"),
+        enum_check("medium", Medium),
+        Index(
+            "ix_textbooks_public_created", "created_at",
+            postgresql_where=text("is_public"), sqlite_where=text("is_public = 1"),
+        ),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
-    grade_id = Column(Integer, ForeignKey("grades.id"), nullable=False, index=True)
-    subject_id = Column(Integer, ForeignKey("subjects.id"), nullable=False, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    grade_id: Mapped[int] = mapped_column(Integer, ForeignKey("grades.id", ondelete="CASCADE"), nullable=False, index=True)
+    subject_id: Mapped[int] = mapped_column(Integer, ForeignKey("subjects.id", ondelete="CASCADE"), nullable=False, index=True)
     
-    title = Column(String(255), nullable=False)
-    description = Column(Text, nullable=True)
-    medium = Column(Enum(Medium), nullable=True, index=True)  # Language: Sinhala, English, Tamil
-    part = Column(String(50), nullable=True)  # e.g., "Part 1", "Part 2"
-    google_drive_id = Column(String(255), nullable=False)  # Google Drive file ID
-    google_drive_url = Column(String(500), nullable=True)  # Shareable Google Drive URL
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    medium: Mapped[Optional[str]] = mapped_column(String(16), nullable=True, index=True)  # Medium value: sinhala, english, tamil
+    part: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # e.g., "Part 1", "Part 2"
+    google_drive_id: Mapped[str] = mapped_column(String(64), nullable=False)  # Google Drive file ID (up to 44 chars)
+    google_drive_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)  # Shareable Google Drive URL
     
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    is_public = Column(Boolean, default=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), index=True)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
+    is_public: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
     
     # Relationships
-    grade = relationship("Grade", back_populates="textbooks")
-    subject = relationship("Subject", back_populates="textbooks")
+    grade: Mapped["Grade"] = relationship("Grade", back_populates="textbooks")
+    subject: Mapped["Subject"] = relationship("Subject", back_populates="textbooks")
     
     def __repr__(self):
-        return f"<Textbook(id={self.id}, title={self.title}, part={self.part})>"
+        return f"<Textbook(id={self.id}, title={reprlib.repr(self.title)}, part={reprlib.repr(self.part)})>"
 
 
 class StudyNote(Base):
     """Study notes document model (uploaded documents for specific lessons/chapters)"""
     __tablename__ = "study_notes_documents"
+    __table_args__ = (
+        Index("ix_study_notes_documents_grade_subject_medium", "grade_id", "subject_id", "medium"),
+        enum_check("medium", Medium),
+        Index(
+            "ix_study_notes_documents_public_created", "created_at",
+            postgresql_where=text("is_public"), sqlite_where=text("is_public = 1"),
+        ),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    grade_id = Column(Integer, ForeignKey("grades.id"), nullable=False, index=True)
-    subject_id = Column(Integer, ForeignKey("subjects.id"), nullable=False, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    owner_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    grade_id: Mapped[int] = mapped_column(Integer, ForeignKey("grades.id", ondelete="CASCADE"), nullable=False, index=True)
+    subject_id: Mapped[int] = mapped_column(Integer, ForeignKey("subjects.id", ondelete="CASCADE"), nullable=False, index=True)
     
-    title = Column(String(255), nullable=False)
-    description = Column(Text, nullable=True)
-    medium = Column(Enum(Medium), nullable=True, index=True)  # Language: Sinhala, English, Tamil
-    lesson = Column(String(255), nullable=True)  # e.g., "Chapter 5", "Lesson 3"
-    google_drive_id = Column(String(255), nullable=False)  # Google Drive file ID
-    google_drive_url = Column(String(500), nullable=True)  # Shareable Google Drive URL
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    medium: Mapped[Optional[str]] = mapped_column(String(16), nullable=True, index=True)  # Medium value: sinhala, english, tamil
+    lesson: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)  # e.g., "Chapter 5", "Lesson 3"
+    google_drive_id: Mapped[str] = mapped_column(String(64), nullable=False)  # Google Drive file ID (up to 44 chars)
+    google_drive_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)  # Shareable Google Drive URL
     
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    is_public = Column(Boolean, default=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), index=True)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
+    is_public: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
     
     # Relationships
-    owner = relationship("User", foreign_keys=[owner_id], back_populates="study_note_documents")
-    grade = relationship("Grade", back_populates="study_notes")
-    subject = relationship("Subject", back_populates="study_notes")
+    owner: Mapped["User"] = relationship("User", foreign_keys=[owner_id], back_populates="study_note_documents")
+    grade: Mapped["Grade"] = relationship("Grade", back_populates="study_notes")
+    subject: Mapped["Subject"] = relationship("Subject", back_populates="study_notes")
     
     def __repr__(self):
-        return f"<StudyNote(id={self.id}, title={self.title}, owner_id={self.owner_id})>"
+        return f"<StudyNote(id={self.id}, title={reprlib.repr(self.title)}, owner_id={self.owner_id})>"
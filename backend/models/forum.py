@@ -1,49 +1,55 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey
-from sqlalchemy.orm import relationship
+import reprlib
+from typing import List, Optional
+from sqlalchemy import Integer, String, Boolean, DateTime, Text, ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
-from ..core.database import Base
+from ..core.database import Base, TagList
 
 
 class ForumPost(Base):
     """Forum posts for discussions"""
     __tablename__ = "forum_posts"
+    # GIN index for tag containment lookups; PostgreSQL only
+    __table_args__ = (
+        Index("ix_forum_posts_tags_gin", "tags", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    title = Column(String(255), nullable=False)
-    content = Column(Text, nullable=False)
-    category = Column(String(100), nullable=False, index=True)
-    tags = Column(String(500), nullable=True)  # Comma-separated tags
-    is_pinned = Column(Boolean, default=False)
-    is_locked = Column(Boolean, default=False)
-    views = Column(Integer, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    category: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    tags: Mapped[Optional[List[str]]] = mapped_column(TagList, nullable=True)  # List of tag strings
+    is_pinned: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    is_locked: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    views: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), index=True)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    user = relationship("User", back_populates="forum_posts")
-    comments = relationship("ForumComment", back_populates="post", cascade="all, delete-orphan")
+    user: Mapped["User"] = relationship("User", back_populates="forum_posts", lazy="selectin")
+    comments: Mapped[List["ForumComment"]] = relationship("ForumComment", back_populates="post", cascade="all, delete-orphan", lazy="selectin")
     
     def __repr__(self):
-        return f"<ForumPost(id={self.id}, title={self.title})>"
+        return f"<ForumPost(id={self.id}, title={reprlib.repr(self.title)})>"
 
 
 class ForumComment(Base):
     """Comments on forum posts"""
     __tablename__ = "forum_comments"
     
-    id = Column(Integer, primary_key=True, index=True)
-    post_id = Column(Integer, ForeignKey("forum_posts.id"), nullable=False, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    content = Column(Text, nullable=False)
-    is_solution = Column(Boolean, default=False)
-    likes = Column(Integer, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    post_id: Mapped[int] = mapped_column(Integer, ForeignKey("forum_posts.id"), nullable=False, index=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    is_solution: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    likes: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), index=True)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    post = relationship("ForumPost", back_populates="comments")
-    user = relationship("User", back_populates="forum_comments")
+    post: Mapped["ForumPost"] = relationship("ForumPost", back_populates="comments")
+    user: Mapped["User"] = relationship("User", back_populates="forum_comments", lazy="selectin")
     
     def __repr__(self):
         return f"<ForumComment(id={self.id}, post_id={self.post_id})>"
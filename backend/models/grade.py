@@ -1,5 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+import reprlib
+from typing import List, Optional
+from sqlalchemy import Integer, String, DateTime, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from ..core.database import Base
 
@@ -8,40 +10,40 @@ class Grade(Base):
     """Grade database model (e.g., Grade 1, Grade 2, ... O-Level)"""
     __tablename__ = "grades"
     
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(50), unique=True, nullable=False, index=True)  # e.g., "Grade 10", "O-Level"
-    level = Column(Integer, nullable=False, index=True)  # e.g., 10, 11 for ordering
-    description = Column(String(255), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String(50), unique=True, nullable=False, index=True)  # e.g., "Grade 10", "O-Level"
+    level: Mapped[int] = mapped_column(Integer, nullable=False, index=True)  # e.g., 10, 11 for ordering
+    description: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
     
-    # Relationships
-    subjects = relationship("Subject", back_populates="grade", cascade="all, delete-orphan")
-    papers = relationship("Paper", back_populates="grade", cascade="all, delete-orphan")
-    textbooks = relationship("Textbook", back_populates="grade", cascade="all, delete-orphan")
-    study_notes = relationship("StudyNote", back_populates="grade", cascade="all, delete-orphan")
+    # Relationships (passive_deletes: rows go via ON DELETE CASCADE instead of being loaded first)
+    subjects: Mapped[List["Subject"]] = relationship("Subject", back_populates="grade", cascade="all, delete-orphan", passive_deletes=True)
+    papers: Mapped[List["Paper"]] = relationship("Paper", back_populates="grade", cascade="all, delete", passive_deletes=True)
+    textbooks: Mapped[List["Textbook"]] = relationship("Textbook", back_populates="grade", cascade="all, delete", passive_deletes=True)
+    study_notes: Mapped[List["StudyNote"]] = relationship("StudyNote", back_populates="grade", cascade="all, delete", passive_deletes=True)
     
     def __repr__(self):
-        return f"<Grade(id={self.id}, name={self.name}, level={self.level})>"
+        return f"<Grade(id={self.id}, name={reprlib.repr(self.name)}, level={self.level})>"
 
 
 class Subject(Base):
     """Subject database model (e.g., Mathematics, Science, etc.)"""
     __tablename__ = "subjects"
     
-    id = Column(Integer, primary_key=True, index=True)
-    grade_id = Column(Integer, ForeignKey("grades.id"), nullable=False, index=True)
-    name = Column(String(100), nullable=False, index=True)  # e.g., "Mathematics", "Science"
-    code = Column(String(20), nullable=True)  # e.g., "MATH", "SCI"
-    description = Column(String(255), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    grade_id: Mapped[int] = mapped_column(Integer, ForeignKey("grades.id", ondelete="CASCADE"), nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False, index=True)  # e.g., "Mathematics", "Science"
+    code: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)  # e.g., "MATH", "SCI"
+    description: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
     
-    # Relationships
-    grade = relationship("Grade", back_populates="subjects")
-    papers = relationship("Paper", back_populates="subject", cascade="all, delete-orphan")
-    textbooks = relationship("Textbook", back_populates="subject", cascade="all, delete-orphan")
-    study_notes = relationship("StudyNote", back_populates="subject", cascade="all, delete-orphan")
+    # Relationships (passive_deletes: rows go via ON DELETE CASCADE instead of being loaded first)
+    grade: Mapped["Grade"] = relationship("Grade", back_populates="subjects")
+    papers: Mapped[List["Paper"]] = relationship("Paper", back_populates="subject", cascade="all, delete", passive_deletes=True)
+    textbooks: Mapped[List["Textbook"]] = relationship("Textbook", back_populates="subject", cascade="all, delete", passive_deletes=True)
+    study_notes: Mapped[List["StudyNote"]] = relationship("StudyNote", back_populates="subject", cascade="all, delete", passive_deletes=True)
     
     def __repr__(self):
-        return f"<Subject(id={self.id}, name={self.name}, grade_id={self.grade_id})>"
+        return f"<Subject(id={self.id}, name={reprlib.repr(self.name)}, grade_id={self.grade_id})>"
@@ -1,5 +1,7 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey
-from sqlalchemy.orm import relationship
+import reprlib
+from typing import Optional
+from sqlalchemy import Integer, String, Boolean, DateTime, Text, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from ..core.database import Base
 
@@ -8,35 +10,35 @@ class Note(Base):
     """Study notes created by users"""
     __tablename__ = "notes"
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    title = Column(String(255), nullable=False)
-    subject = Column(String(100), nullable=False, index=True)
-    content = Column(Text, nullable=False)
-    is_public = Column(Boolean, default=True)
-    is_featured = Column(Boolean, default=False)
-    views = Column(Integer, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    subject: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    is_public: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    is_featured: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    views: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), index=True)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    user = relationship("User", back_populates="notes")
+    user: Mapped["User"] = relationship("User", back_populates="notes")
     
     def __repr__(self):
-        return f"<Note(id={self.id}, title={self.title}, subject={self.subject})>"
+        return f"<Note(id={self.id}, title={reprlib.repr(self.title)}, subject={reprlib.repr(self.subject)})>"
 
 
 class StudyMaterial(Base):
     """Study materials and attachments"""
     __tablename__ = "study_materials"
     
-    id = Column(Integer, primary_key=True, index=True)
-    note_id = Column(Integer, ForeignKey("notes.id"), nullable=False, index=True)
-    filename = Column(String(255), nullable=False)
-    file_path = Column(String(500), nullable=False)
-    file_type = Column(String(50), nullable=False)
-    file_size = Column(Integer, nullable=False)  # Size in bytes
-    uploaded_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    note_id: Mapped[int] = mapped_column(Integer, ForeignKey("notes.id"), nullable=False, index=True)
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    file_path: Mapped[str] = mapped_column(String(500), nullable=False)
+    file_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    file_size: Mapped[int] = mapped_column(Integer, nullable=False)  # Size in bytes
+    uploaded_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now())
     
     def __repr__(self):
-        return f"<StudyMaterial(id={self.id}, filename={self.filename})>"
+        return f"<StudyMaterial(id={self.id}, filename={reprlib.repr(self.filename)})>"
@@ -1,5 +1,7 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey
-from sqlalchemy.orm import relationship
+import reprlib
+from typing import List, Optional
+from sqlalchemy import Integer, String, Boolean, DateTime, Text, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from ..core.database import Base
 
@@ -8,42 +10,42 @@ class Question(Base):
     """Q&A questions from students"""
     __tablename__ = "questions"
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    title = Column(String(255), nullable=False)
-    content = Column(Text, nullable=False)
-    subject = Column(String(100), nullable=False, index=True)
-    difficulty = Column(String(20), nullable=True)  # easy, medium, hard
-    is_answered = Column(Boolean, default=False)
-    views = Column(Integer, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    subject: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    difficulty: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)  # easy, medium, hard
+    is_answered: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    views: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), index=True)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    user = relationship("User", back_populates="questions")
-    answers = relationship("Answer", back_populates="question", cascade="all, delete-orphan")
+    user: Mapped["User"] = relationship("User", back_populates="questions", lazy="selectin")
+    answers: Mapped[List["Answer"]] = relationship("Answer", back_populates="question", cascade="all, delete-orphan", lazy="selectin")
     
     def __repr__(self):
-        return f"<Question(id={self.id}, title={self.title}, subject={self.subject})>"
+        return f"<Question(id={self.id}, title={reprlib.repr(self.title)}, subject={reprlib.repr(self.subject)})>"
 
 
 class Answer(Base):
     """Answers to Q&A questions"""
     __tablename__ = "answers"
     
-    id = Column(Integer, primary_key=True, index=True)
-    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    content = Column(Text, nullable=False)
-    is_accepted = Column(Boolean, default=False)
-    upvotes = Column(Integer, default=0)
-    downvotes = Column(Integer, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    question_id: Mapped[int] = mapped_column(Integer, ForeignKey("questions.id"), nullable=False, index=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    is_accepted: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    upvotes: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    downvotes: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), index=True)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    question = relationship("Question", back_populates="answers")
-    user = relationship("User", back_populates="answers")
+    question: Mapped["Question"] = relationship("Question", back_populates="answers")
+    user: Mapped["User"] = relationship("User", back_populates="answers", lazy="selectin")
     
     def __repr__(self):
         return f"<Answer(id={self.id}, question_id={self.question_id})>"
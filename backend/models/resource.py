@@ -1,8 +1,10 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Enum
-from sqlalchemy.orm import relationship
+import reprlib
+from typing import List, Optional
+from sqlalchemy import Integer, String, Boolean, DateTime, Text, ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from enum import Enum as PyEnum
-from ..core.database import Base
+from ..core.database import Base, TagList, enum_check
 
 
 class ResourceCategory(str, PyEnum):
@@ -27,54 +29,59 @@ class ResourceCategory(str, PyEnum):
 class Resource(Base):
     """Learning resource (notes, videos, links, etc.)"""
     __tablename__ = "resources"
+    # GIN index for tag containment lookups; PostgreSQL only
+    __table_args__ = (
+        Index("ix_resources_tags_gin", "tags", postgresql_using="gin").ddl_if(dialect="postgresql"),
+        enum_check("category", ResourceCategory),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    title = Column(String(255), nullable=False)
-    description = Column(Text, nullable=True)
-    content = Column(Text, nullable=False)
-    category = Column(Enum(ResourceCategory), nullable=False, index=True)
-    tags = Column(String(500), nullable=True)  # Comma-separated tags
-    is_published = Column(Boolean, default=True)
-    is_featured = Column(Boolean, default=False)
-    views = Column(Integer, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    category: Mapped[str] = mapped_column(String(32), nullable=False, index=True)  # ResourceCategory value
+    tags: Mapped[Optional[List[str]]] = mapped_column(TagList, nullable=True)  # List of tag strings
+    is_published: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    is_featured: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    views: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), index=True)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    user = relationship("User", back_populates="resources")
-    likes = relationship("ResourceLike", back_populates="resource", cascade="all, delete-orphan")
-    comments = relationship("ResourceComment", back_populates="resource", cascade="all, delete-orphan")
+    user: Mapped["User"] = relationship("User", back_populates="resources", lazy="selectin")
+    likes: Mapped[List["ResourceLike"]] = relationship("ResourceLike", back_populates="resource", cascade="all, delete-orphan")
+    comments: Mapped[List["ResourceComment"]] = relationship("ResourceComment", back_populates="resource", cascade="all, delete-orphan")
     
     def __repr__(self):
-        return f"<Resource(id={self.id}, title={self.title}, category={self.category})>"
+        return f"<Resource(id={self.id}, title={reprlib.repr(self.title)}, category={self.category})>"
 
 
 class ResourceLike(Base):
     """User likes for resources"""
     __tablename__ = "resource_likes"
     
-    id = Column(Integer, primary_key=True, index=True)
-    resource_id = Column(Integer, ForeignKey("resources.id"), nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    resource_id: Mapped[int] = mapped_column(Integer, ForeignKey("resources.id"), nullable=False)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now())
     
     # Relationships
-    resource = relationship("Resource", back_populates="likes")
-    user = relationship("User")
+    resource: Mapped["Resource"] = relationship("Resource", back_populates="likes")
+    user: Mapped["User"] = relationship("User")
 
 
 class ResourceComment(Base):
     """Comments on resources"""
     __tablename__ = "resource_comments"
     
-    id = Column(Integer, primary_key=True, index=True)
-    resource_id = Column(Integer, ForeignKey("resources.id"), nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    content = Column(Text, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    resource_id: Mapped[int] = mapped_column(Integer, ForeignKey("resources.id"), nullable=False)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    resource = relationship("Resource", back_populates="comments")
-    user = relationship("User")
+    resource: Mapped["Resource"] = relationship("Resource", back_populates="comments")
+    user: Mapped["User"] = relationship("User")
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
+from typing import Optional
+from sqlalchemy import Integer, String, DateTime, ForeignKey, Boolean, func
+from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime, timedelta
 from ..core.database import Base
 from ..core.config import settings
@@ -8,12 +10,13 @@ class VerificationToken(Base):
     """Email verification token model"""
     __tablename__ = "verification_tokens"
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    token = Column(String(255), unique=True, index=True, nullable=False)
-    is_used = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    expires_at = Column(DateTime, default=lambda: datetime.utcnow() + timedelta(hours=24))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # hash_token() of the emailed token: fixed 64-char keys, and a leaked table can't be replayed
+    token_hash: Mapped[str] = mapped_column("token", String(64), unique=True, index=True, nullable=False)
+    is_used: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now())
+    expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=lambda: datetime.utcnow() + timedelta(hours=24))
     
     def is_valid(self):
         """Check if token is still valid"""
@@ -27,12 +30,13 @@ class PasswordResetToken(Base):
     """Password reset token model"""
     __tablename__ = "password_reset_tokens"
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    token = Column(String(255), unique=True, index=True, nullable=False)
-    is_used = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    expires_at = Column(DateTime, default=lambda: datetime.utcnow() + timedelta(hours=1))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # hash_token() of the emailed token: fixed 64-char keys, and a leaked table can't be replayed
+    token_hash: Mapped[str] = mapped_column("token", String(64), unique=True, index=True, nullable=False)
+    is_used: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now())
+    expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=lambda: datetime.utcnow() + timedelta(hours=1))
     
     def is_valid(self):
         """Check if token is still valid"""
@@ -1,5 +1,7 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
-from sqlalchemy.orm import relationship
+import reprlib
+from typing import List, Optional
+from sqlalchemy import Integer, String, Boolean, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from ..core.database import Base
 
@@ -8,29 +10,30 @@ class User(Base):
     """User database model"""
     __tablename__ = "users"
     
-    id = Column(Integer, primary_key=True, index=True)
-    username = Column(String(50), unique=True, index=True, nullable=False)
-    email = Column(String(100), unique=True, index=True, nullable=False)
-    hashed_password = Column(String, nullable=False)
-    full_name = Column(String(100))
-    bio = Column(String(500), nullable=True)
-    avatar_url = Column(String(500), nullable=True)
-    is_active = Column(Boolean, default=True)
-    is_verified = Column(Boolean, default=False)
-    is_admin = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    last_login = Column(DateTime, nullable=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    username: Mapped[str] = mapped_column(String(50), unique=True, index=True, nullable=False)
+    email: Mapped[str] = mapped_column(String(100), unique=True, index=True, nullable=False)
+    hashed_password: Mapped[str] = mapped_column(String, nullable=False)
+    full_name: Mapped[Optional[str]] = mapped_column(String(100))
+    bio: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    avatar_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    is_verified: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    is_admin: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
+    last_login: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
-    # Relationships
-    resources = relationship("Resource", back_populates="user", cascade="all, delete-orphan")
-    notes = relationship("Note", back_populates="user", cascade="all, delete-orphan")
-    forum_posts = relationship("ForumPost", back_populates="user", cascade="all, delete-orphan")
-    forum_comments = relationship("ForumComment", back_populates="user", cascade="all, delete-orphan")
-    questions = relationship("Question", back_populates="user", cascade="all, delete-orphan")
-    answers = relationship("Answer", back_populates="user", cascade="all, delete-orphan")
-    papers = relationship("Paper", back_populates="owner", cascade="all, delete-orphan")
-    study_note_documents = relationship("StudyNote", back_populates="owner", cascade="all, delete-orphan")
+    # Relationships (lazy="raise": no route needs these collections, so touching one is a bug rather than
+    # a silent SELECT per collection; load them explicitly with selectinload where needed. Deletes still cascade.)
+    resources: Mapped[List["Resource"]] = relationship("Resource", back_populates="user", cascade="all, delete-orphan", lazy="raise")
+    notes: Mapped[List["Note"]] = relationship("Note", back_populates="user", cascade="all, delete-orphan", lazy="raise")
+    forum_posts: Mapped[List["ForumPost"]] = relationship("ForumPost", back_populates="user", cascade="all, delete-orphan", lazy="raise")
+    forum_comments: Mapped[List["ForumComment"]] = relationship("ForumComment", back_populates="user", cascade="all, delete-orphan", lazy="raise")
+    questions: Mapped[List["Question"]] = relationship("Question", back_populates="user", cascade="all, delete-orphan", lazy="raise")
+    answers: Mapped[List["Answer"]] = relationship("Answer", back_populates="user", cascade="all, delete-orphan", lazy="raise")
+    papers: Mapped[List["Paper"]] = relationship("Paper", back_populates="owner", cascade="all, delete-orphan", lazy="raise")
+    study_note_documents: Mapped[List["StudyNote"]] = relationship("StudyNote", back_populates="owner", cascade="all, delete-orphan", lazy="raise")
     
     def __repr__(self):
-        return f"<User(id={self.id}, username={self.username}, email={self.email})>"
+        return f"<User(id={self.id}, username={reprlib.repr(self.username)}, email={reprlib.repr(self.email)})>"
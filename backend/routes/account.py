@@ -1,9 +1,12 @@
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, status, Header
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from datetime import datetime
 
 from ..core.database import get_db
-from ..core.security import verify_password, get_password_hash, verify_token
+from ..core.security import get_password_hash_async, verify_password_async, verify_token
 from ..models.user import User
 from ..schemas.user import (
     UserResponse,
@@ -107,7 +110,7 @@ def update_profile(
 
 
 @router.post("/change-password", response_model=MessageResponse)
-def change_password(
+async def change_password(
     password_data: PasswordChange,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -118,24 +121,30 @@ def change_password(
     - **current_password**: Current password for verification
     - **new_password**: New password (min 8 chars, uppercase, digit, special char)
     """
-    # Verify current password
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    # Verify current password (nothing else is hashed if this fails)
+    if not await verify_password_async(password_data.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Current password is incorrect"
         )
     
+    # Check for password reuse while hashing the new password on another worker thread
+    same_password, new_hash = await asyncio.gather(
+        verify_password_async(password_data.new_password, current_user.hashed_password),
+        get_password_hash_async(password_data.new_password),
+    )
+    
     # Prevent using same password
-    if verify_password(password_data.new_password, current_user.hashed_password):
+    if same_password:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="New password must be different from current password"
         )
     
     # Update password
-    current_user.hashed_password = get_password_hash(password_data.new_password)
+    current_user.hashed_password = new_hash
     current_user.updated_at = datetime.utcnow()
-    db.commit()
+    await run_in_threadpool(db.commit)  # Sync Session: keep the write off the event loop
     
     return MessageResponse(message="Password changed successfully")
 
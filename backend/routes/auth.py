@@ -1,18 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from datetime import datetime
+from urllib.parse import urlencode, quote
+import httpx
 
 from ..core.database import get_db
 from ..core.security import (
-    verify_password,
+    verify_and_update_password,
+    DUMMY_PASSWORD_HASH,
     get_password_hash,
+    get_password_hash_async,
     create_access_token,
     create_refresh_token,
     verify_token,
     get_current_user,
 )
-from ..core.email import generate_token, send_verification_email, send_password_reset_email
+from ..core.email import generate_token, hash_token, send_verification_email, send_password_reset_email
 from ..core.config import settings
+from ..core.http_client import get_http_client
 from ..models.user import User
 from ..models.token import VerificationToken, PasswordResetToken
 from ..schemas.user import (
@@ -28,6 +33,18 @@ from ..schemas.user import (
 
 router = APIRouter(tags=["auth"])
 
+# Google OAuth authorization URL; built once from settings (None when OAuth isn't configured)
+GOOGLE_AUTH_URL = (
+    "https://accounts.google.com/o/oauth2/v2/auth?" + urlencode({
+        "client_id": settings.google_oauth_client_id,
+        "redirect_uri": settings.google_oauth_redirect_uri,
+        "response_type": "code",
+        "scope": "openid email profile",
+        "access_type": "offline",
+    }, quote_via=quote)
+    if settings.google_oauth_client_id and settings.google_oauth_client_secret else None
+)
+
 
 @router.post("/register", status_code=201)
 async def register(user_data: UserCreate, db: Session = Depends(get_db)):
@@ -41,19 +58,21 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     
     Returns a message asking user to verify their email
     """
-    # Check if user already exists
-    db_user = db.query(User).filter(
-        (User.username == user_data.username) | (User.email == user_data.email)
-    ).first()
-    
-    if db_user:
+    # Check if user already exists (SELECT EXISTS, no row is loaded)
+    user_exists = db.query(
+        db.query(User.id).filter(
+            (User.username == user_data.username) | (User.email == user_data.email)
+        ).exists()
+    ).scalar()
+    
+    if user_exists:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Username or email already registered"
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     db_user = User(
         username=user_data.username,
         email=user_data.email,
@@ -70,7 +89,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     verification_token_str = generate_token()
     verification_token = VerificationToken(
         user_id=db_user.id,
-        token=verification_token_str
+        token_hash=hash_token(verification_token_str)
     )
     db.add(verification_token)
     db.commit()
@@ -97,7 +116,7 @@ async def verify_email(token: str = Query(...), db: Session = Depends(get_db)):
     """
     # Find verification token
     verification_token = db.query(VerificationToken).filter(
-        VerificationToken.token == token
+        VerificationToken.token_hash == hash_token(token)
     ).first()
     
     if not verification_token:
@@ -146,7 +165,12 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
         (User.email == user_data.username_or_email)
     ).first()
     
-    if not db_user or not verify_password(user_data.password, db_user.hashed_password):
+    # Always run one verify, against a dummy hash for unknown users, so response time doesn't reveal
+    # which usernames exist
+    verified, new_hash = verify_and_update_password(
+        user_data.password, db_user.hashed_password if db_user else DUMMY_PASSWORD_HASH
+    )
+    if not db_user or not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username, email, or password"
@@ -166,6 +190,9 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
     
     # Update last login
     db_user.last_login = datetime.utcnow()
+    # Move legacy bcrypt hashes to argon2 while we have the plaintext
+    if new_hash:
+        db_user.hashed_password = new_hash
     db.commit()
     
     # Generate tokens
@@ -238,7 +265,7 @@ async def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(
         reset_token = generate_token()
         password_reset = PasswordResetToken(
             user_id=user.id,
-            token=reset_token
+            token_hash=hash_token(reset_token)
         )
         db.add(password_reset)
         db.commit()
@@ -267,7 +294,7 @@ def reset_password(token: str = Query(...), new_password: str = Query(...), db:
     """
     # Find password reset token
     password_reset = db.query(PasswordResetToken).filter(
-        PasswordResetToken.token == token
+        PasswordResetToken.token_hash == hash_token(token)
     ).first()
     
     if not password_reset:
@@ -317,23 +344,13 @@ def get_google_auth_url():
     Get Google OAuth authorization URL for user login
     Frontend should redirect to this URL
     """
-    if not settings.google_oauth_client_id or not settings.google_oauth_client_secret:
+    if GOOGLE_AUTH_URL is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Google OAuth is not configured. Please set GOOGLE_OAUTH_CLIENT_ID and GOOGLE_OAUTH_CLIENT_SECRET"
         )
     
-    # Google OAuth 2.0 authorization endpoint
-    google_auth_url = (
-        f"https://accounts.google.com/o/oauth2/v2/auth?"
-        f"client_id={settings.google_oauth_client_id}&"
-        f"redirect_uri={settings.google_oauth_redirect_uri}&"
-        f"response_type=code&"
-        f"scope=openid%20email%20profile&"
-        f"access_type=offline"
-    )
-    
-    return {"auth_url": google_auth_url}
+    return {"auth_url": GOOGLE_AUTH_URL}
 
 
 @router.post("/google/callback")
@@ -353,7 +370,7 @@ async def google_oauth_callback(request: GoogleOAuthCallback, db: Session = Depe
         )
     
     try:
-        import requests
+        http = get_http_client()
         
         # Exchange code for tokens
         token_url = "https://oauth2.googleapis.com/token"
@@ -371,7 +388,7 @@ async def google_oauth_callback(request: GoogleOAuthCallback, db: Session = Depe
         print(f"  Redirect URI: {settings.google_oauth_redirect_uri}")
         print(f"  Code: {code[:20]}...")
         
-        token_response = requests.post(token_url, data=token_data)
+        token_response = await http.post(token_url, data=token_data)
         
         print(f"[Google OAuth] Token Response Status: {token_response.status_code}")
         print(f"[Google OAuth] Token Response: {token_response.text[:200]}")
@@ -391,7 +408,7 @@ async def google_oauth_callback(request: GoogleOAuthCallback, db: Session = Depe
         # Get user info from Google
         userinfo_url = "https://www.googleapis.com/oauth2/v2/userinfo"
         headers = {"Authorization": f"Bearer {tokens['access_token']}"}
-        userinfo_response = requests.get(userinfo_url, headers=headers)
+        userinfo_response = await http.get(userinfo_url, headers=headers)
         
         print(f"[Google OAuth] User Info Response Status: {userinfo_response.status_code}")
         
@@ -428,10 +445,15 @@ async def google_oauth_callback(request: GoogleOAuthCallback, db: Session = Depe
             # Generate username from email
             username = email.split("@")[0]
             
-            # Ensure unique username
-            counter = 1
+            # Ensure unique username: fetch every taken name with this prefix in one query,
+            # then take the first free numeric suffix
             base_username = username
-            while db.query(User).filter(User.username == username).first():
+            taken = {
+                name for (name,) in
+                db.query(User.username).filter(User.username.startswith(base_username, autoescape=True))
+            }
+            counter = 1
+            while username in taken:
                 username = f"{base_username}{counter}"
                 counter += 1
             
@@ -441,7 +463,7 @@ async def google_oauth_callback(request: GoogleOAuthCallback, db: Session = Depe
                 full_name=name,
                 is_active=True,
                 is_verified=True,  # Google-verified emails are trusted
-                hashed_password=get_password_hash(google_id),  # Use google_id as password seed
+                hashed_password=await get_password_hash_async(google_id),  # Use google_id as password seed
             )
             db.add(user)
             db.commit()
@@ -470,7 +492,7 @@ async def google_oauth_callback(request: GoogleOAuthCallback, db: Session = Depe
             user=UserResponse.from_orm(user)
         )
         
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"[Google OAuth] ❌ Request error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
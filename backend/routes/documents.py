@@ -6,11 +6,14 @@ import os
 from datetime import datetime
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..core.database import get_db
+from ..core import refdata
+from ..core.database import get_db, get_async_db
 from ..core.security import get_current_user
-from ..core.google_drive import GoogleDriveManager
+from ..core.google_drive import get_drive_manager
 from ..core.config import settings
 from ..models.user import User
 from ..models.grade import Grade, Subject
@@ -59,10 +62,10 @@ def validate_file(file: UploadFile) -> str:
 # ==================== Grade Routes ====================
 
 @router.get("/grades", response_model=List[GradeResponse])
-async def get_all_grades(db: Session = Depends(get_db)):
+async def get_all_grades(db: AsyncSession = Depends(get_async_db)):
     """Get all grades"""
     try:
-        grades = db.query(Grade).order_by(Grade.level).all()
+        grades = (await db.scalars(select(Grade).order_by(Grade.level))).all()
         return grades
     except Exception as e:
         raise HTTPException(
@@ -72,10 +75,10 @@ async def get_all_grades(db: Session = Depends(get_db)):
 
 
 @router.get("/grades/{grade_id}", response_model=GradeResponse)
-async def get_grade(grade_id: int, db: Session = Depends(get_db)):
+async def get_grade(grade_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get specific grade"""
     try:
-        grade = db.query(Grade).filter(Grade.id == grade_id).first()
+        grade = await db.get(Grade, grade_id)
         if not grade:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -92,17 +95,17 @@ async def get_grade(grade_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/grades/{grade_id}/subjects", response_model=List[SubjectResponse])
-async def get_grade_subjects(grade_id: int, db: Session = Depends(get_db)):
+async def get_grade_subjects(grade_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get subjects for a specific grade"""
     try:
-        grade = db.query(Grade).filter(Grade.id == grade_id).first()
+        grade = await db.get(Grade, grade_id)
         if not grade:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Grade not found"
             )
         
-        subjects = db.query(Subject).filter(Subject.grade_id == grade_id).all()
+        subjects = (await db.scalars(select(Subject).where(Subject.grade_id == grade_id))).all()
         return subjects
     except HTTPException:
         raise
@@ -121,8 +124,7 @@ async def create_grade(
     """Create a new grade"""
     try:
         # Check if grade already exists
-        existing_grade = db.query(Grade).filter(Grade.name == grade_data.name).first()
-        if existing_grade:
+        if grade_data.name in refdata.grade_by_name():
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Grade '{grade_data.name}' already exists"
@@ -137,6 +139,7 @@ async def create_grade(
         db.add(new_grade)
         db.commit()
         db.refresh(new_grade)
+        refdata.clear()
         
         return new_grade
     except HTTPException:
@@ -185,6 +188,7 @@ async def create_subject(
         db.add(new_subject)
         db.commit()
         db.refresh(new_subject)
+        refdata.clear()
         
         return new_subject
     except HTTPException:
@@ -219,18 +223,16 @@ async def upload_paper(
     file_ext = validate_file(file)
     
     # Verify grade and subject exist
-    grade = db.query(Grade).filter(Grade.id == grade_id).first()
-    if not grade:
+    grade_subjects = refdata.subject_by_grade_id().get(grade_id)
+    if grade_subjects is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Grade not found")
     
-    subject = db.query(Subject).filter(Subject.id == subject_id, Subject.grade_id == grade_id).first()
-    if not subject:
+    if subject_id not in grade_subjects:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Subject not found for this grade")
     
     try:
-        # Read file content
-        content = await file.read()
-        file_size = len(content)
+        # Size counted by the multipart parser; the body stays spooled, not read into memory
+        file_size = file.size
         
         # Check file size
         if file_size > MAX_FILE_SIZE:
@@ -240,8 +242,8 @@ async def upload_paper(
             )
         
         # Upload to Google Drive (or use mock in development mode)
-        drive_manager = GoogleDriveManager()
-        filename = f"Paper_{grade.id}_{subject.id}_{datetime.utcnow().timestamp()}_{file.filename}"
+        drive_manager = get_drive_manager()
+        filename = f"Paper_{grade_id}_{subject_id}_{datetime.utcnow().timestamp()}_{file.filename}"
         
         # Only use folder_id if it's configured and not empty
         folder_id = settings.google_drive_papers_folder_id
@@ -272,8 +274,8 @@ async def upload_paper(
             subject_id=subject_id,
             title=title,
             description=description,
-            paper_type=paper_type_enum,
-            medium=medium_enum,
+            paper_type=paper_type_enum.value,
+            medium=medium_enum.value,
             exam_year=exam_year,
             google_drive_id=file_id,
             google_drive_url=shareable_link,
@@ -331,20 +333,20 @@ async def get_papers(
     paper_type: Optional[str] = None,
     skip: int = 0,
     limit: int = 20,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get papers with optional filtering"""
     try:
-        query = db.query(Paper).filter(Paper.is_public == True)
+        query = select(Paper).where(Paper.is_public == True)
         
         if grade_id:
-            query = query.filter(Paper.grade_id == grade_id)
+            query = query.where(Paper.grade_id == grade_id)
         if subject_id:
-            query = query.filter(Paper.subject_id == subject_id)
+            query = query.where(Paper.subject_id == subject_id)
         if paper_type:
-            query = query.filter(Paper.paper_type == paper_type)
+            query = query.where(Paper.paper_type == paper_type)
         
-        papers = query.order_by(Paper.created_at.desc()).offset(skip).limit(limit).all()
+        papers = (await db.scalars(query.order_by(Paper.created_at.desc()).offset(skip).limit(limit))).all()
         return papers
     except Exception as e:
         raise HTTPException(
@@ -354,10 +356,10 @@ async def get_papers(
 
 
 @router.get("/papers/{paper_id}", response_model=PaperResponse)
-async def get_paper(paper_id: int, db: Session = Depends(get_db)):
+async def get_paper(paper_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get specific paper"""
     try:
-        paper = db.query(Paper).filter(Paper.id == paper_id).first()
+        paper = await db.get(Paper, paper_id)
         if not paper:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Paper not found")
         if not paper.is_public:
@@ -389,8 +391,8 @@ async def delete_paper(
         
         # Delete from Google Drive
         try:
-            drive_manager = GoogleDriveManager()
-            drive_manager.delete_file(paper.google_drive_id)
+            drive_manager = get_drive_manager()
+            await drive_manager.delete_file_async(paper.google_drive_id)
         except Exception as e:
             print(f"Warning: Failed to delete from Google Drive: {str(e)}")
         
@@ -428,18 +430,16 @@ async def upload_textbook(
     file_ext = validate_file(file)
     
     # Verify grade and subject exist
-    grade = db.query(Grade).filter(Grade.id == grade_id).first()
-    if not grade:
+    grade_subjects = refdata.subject_by_grade_id().get(grade_id)
+    if grade_subjects is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Grade not found")
     
-    subject = db.query(Subject).filter(Subject.id == subject_id, Subject.grade_id == grade_id).first()
-    if not subject:
+    if subject_id not in grade_subjects:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Subject not found for this grade")
     
     try:
-        # Read file content
-        content = await file.read()
-        file_size = len(content)
+        # Size counted by the multipart parser; the body stays spooled, not read into memory
+        file_size = file.size
         
         # Check file size
         if file_size > MAX_FILE_SIZE:
@@ -449,8 +449,8 @@ async def upload_textbook(
             )
         
         # Upload to Google Drive (or use mock in development mode)
-        drive_manager = GoogleDriveManager()
-        filename = f"Textbook_{grade.id}_{subject.id}_{datetime.utcnow().timestamp()}_{file.filename}"
+        drive_manager = get_drive_manager()
+        filename = f"Textbook_{grade_id}_{subject_id}_{datetime.utcnow().timestamp()}_{file.filename}"
         
         # Only use folder_id if it's configured and not empty
         folder_id = settings.google_drive_textbooks_folder_id
@@ -473,7 +473,7 @@ async def upload_textbook(
             subject_id=subject_id,
             title=title,
             description=description,
-            medium=medium_enum,
+            medium=medium_enum.value,
             part=part,
             google_drive_id=file_id,
             google_drive_url=shareable_link,
@@ -510,18 +510,18 @@ async def get_textbooks(
     subject_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 20,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get textbooks with optional filtering"""
     try:
-        query = db.query(Textbook).filter(Textbook.is_public == True)
+        query = select(Textbook).where(Textbook.is_public == True)
         
         if grade_id:
-            query = query.filter(Textbook.grade_id == grade_id)
+            query = query.where(Textbook.grade_id == grade_id)
         if subject_id:
-            query = query.filter(Textbook.subject_id == subject_id)
+            query = query.where(Textbook.subject_id == subject_id)
         
-        textbooks = query.order_by(Textbook.created_at.desc()).offset(skip).limit(limit).all()
+        textbooks = (await db.scalars(query.order_by(Textbook.created_at.desc()).offset(skip).limit(limit))).all()
         return textbooks
     except Exception as e:
         raise HTTPException(
@@ -550,10 +550,10 @@ async def get_user_textbooks(
 
 
 @router.get("/textbooks/{textbook_id}", response_model=TextbookResponse)
-async def get_textbook(textbook_id: int, db: Session = Depends(get_db)):
+async def get_textbook(textbook_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get specific textbook"""
     try:
-        textbook = db.query(Textbook).filter(Textbook.id == textbook_id).first()
+        textbook = await db.get(Textbook, textbook_id)
         if not textbook:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Textbook not found")
         if not textbook.is_public:
@@ -585,8 +585,8 @@ async def delete_textbook(
         
         # Delete from Google Drive
         try:
-            drive_manager = GoogleDriveManager()
-            drive_manager.delete_file(textbook.google_drive_id)
+            drive_manager = get_drive_manager()
+            await drive_manager.delete_file_async(textbook.google_drive_id)
         except Exception as e:
             print(f"Warning: Failed to delete from Google Drive: {str(e)}")
         
@@ -624,18 +624,16 @@ async def upload_study_notes(
     file_ext = validate_file(file)
     
     # Verify grade and subject exist
-    grade = db.query(Grade).filter(Grade.id == grade_id).first()
-    if not grade:
+    grade_subjects = refdata.subject_by_grade_id().get(grade_id)
+    if grade_subjects is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Grade not found")
     
-    subject = db.query(Subject).filter(Subject.id == subject_id, Subject.grade_id == grade_id).first()
-    if not subject:
+    if subject_id not in grade_subjects:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Subject not found for this grade")
     
     try:
-        # Read file content
-        content = await file.read()
-        file_size = len(content)
+        # Size counted by the multipart parser; the body stays spooled, not read into memory
+        file_size = file.size
         
         # Check file size
         if file_size > MAX_FILE_SIZE:
@@ -645,8 +643,8 @@ async def upload_study_notes(
             )
         
         # Upload to Google Drive (or use mock in development mode)
-        drive_manager = GoogleDriveManager()
-        filename = f"StudyNote_{grade.id}_{subject.id}_{datetime.utcnow().timestamp()}_{file.filename}"
+        drive_manager = get_drive_manager()
+        filename = f"StudyNote_{grade_id}_{subject_id}_{datetime.utcnow().timestamp()}_{file.filename}"
         
         # Only use folder_id if it's configured and not empty
         folder_id = settings.google_drive_notes_folder_id
@@ -670,7 +668,7 @@ async def upload_study_notes(
             subject_id=subject_id,
             title=title,
             description=description,
-            medium=medium_enum,
+            medium=medium_enum.value,
             lesson=lesson,
             google_drive_id=file_id,
             google_drive_url=shareable_link,
@@ -707,18 +705,18 @@ async def get_study_notes(
     subject_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 20,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get study notes with optional filtering"""
     try:
-        query = db.query(StudyNote).filter(StudyNote.is_public == True)
+        query = select(StudyNote).where(StudyNote.is_public == True)
         
         if grade_id:
-            query = query.filter(StudyNote.grade_id == grade_id)
+            query = query.where(StudyNote.grade_id == grade_id)
         if subject_id:
-            query = query.filter(StudyNote.subject_id == subject_id)
+            query = query.where(StudyNote.subject_id == subject_id)
         
-        notes = query.order_by(StudyNote.created_at.desc()).offset(skip).limit(limit).all()
+        notes = (await db.scalars(query.order_by(StudyNote.created_at.desc()).offset(skip).limit(limit))).all()
         return notes
     except Exception as e:
         raise HTTPException(
@@ -748,10 +746,10 @@ async def get_user_study_notes(
 
 
 @router.get("/study-notes/{note_id}", response_model=StudyNoteResponse)
-async def get_study_note(note_id: int, db: Session = Depends(get_db)):
+async def get_study_note(note_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get specific study note"""
     try:
-        note = db.query(StudyNote).filter(StudyNote.id == note_id).first()
+        note = await db.get(StudyNote, note_id)
         if not note:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Study note not found")
         if not note.is_public:
@@ -783,8 +781,8 @@ async def delete_study_note(
         
         # Delete from Google Drive
         try:
-            drive_manager = GoogleDriveManager()
-            drive_manager.delete_file(note.google_drive_id)
+            drive_manager = get_drive_manager()
+            await drive_manager.delete_file_async(note.google_drive_id)
         except Exception as e:
             print(f"Warning: Failed to delete from Google Drive: {str(e)}")
         
@@ -10,7 +10,7 @@ from sqlalchemy.orm import Session
 
 from ..core.database import get_db
 from ..core.security import get_current_user
-from ..core.google_drive import GoogleDriveManager
+from ..core.google_drive import direct_download_url, get_drive_manager, preview_url, thumbnail_url
 from ..core.config import settings
 from ..models.user import User
 from ..models.document import Paper, Textbook, StudyNote, PaperType
@@ -79,7 +79,7 @@ async def upload_paper(
             )
         
         # Get Google Drive manager
-        drive_manager = GoogleDriveManager()
+        drive_manager = get_drive_manager()
         
         # Upload to Google Drive
         file_id, shareable_link = await drive_manager.upload_file_from_upload(
@@ -94,7 +94,7 @@ async def upload_paper(
         paper = Paper(
             title=title,
             description=description,
-            paper_type=paper_type_enum,
+            paper_type=paper_type_enum.value,
             exam_year=exam_year,
             grade_id=grade_id,
             subject_id=subject_id,
@@ -113,7 +113,7 @@ async def upload_paper(
             "file_id": file_id,
             "download_url": f"/api/files/download/{file_id}",
             "preview_url": f"/api/files/preview/{file_id}",
-            "thumbnail_url": f"https://drive.google.com/thumbnail?id={file_id}&sz=w400",
+            "thumbnail_url": thumbnail_url(file_id, "w400"),
             "message": "Paper uploaded successfully"
         }
         
@@ -151,7 +151,7 @@ async def list_papers(
         if paper_type:
             try:
                 paper_type_enum = PaperType(paper_type)
-                query = query.filter(Paper.paper_type == paper_type_enum)
+                query = query.filter(Paper.paper_type == paper_type_enum.value)
             except ValueError:
                 pass
         if exam_year:
@@ -164,14 +164,14 @@ async def list_papers(
                 "id": p.id,
                 "title": p.title,
                 "description": p.description,
-                "paper_type": p.paper_type.value,
+                "paper_type": p.paper_type,
                 "exam_year": p.exam_year,
                 "grade_id": p.grade_id,
                 "subject_id": p.subject_id,
                 "created_at": p.created_at.isoformat(),
                 "download_url": f"/api/files/download/{p.google_drive_id}",
                 "preview_url": f"/api/files/preview/{p.google_drive_id}",
-                "thumbnail_url": f"https://drive.google.com/thumbnail?id={p.google_drive_id}&sz=w400"
+                "thumbnail_url": thumbnail_url(p.google_drive_id, "w400")
             }
             for p in papers
         ]
@@ -198,7 +198,7 @@ async def get_paper(paper_id: int, db: Session = Depends(get_db)):
             "id": paper.id,
             "title": paper.title,
             "description": paper.description,
-            "paper_type": paper.paper_type.value,
+            "paper_type": paper.paper_type,
             "exam_year": paper.exam_year,
             "grade_id": paper.grade_id,
             "subject_id": paper.subject_id,
@@ -207,7 +207,7 @@ async def get_paper(paper_id: int, db: Session = Depends(get_db)):
             "updated_at": paper.updated_at.isoformat(),
             "download_url": f"/api/files/download/{paper.google_drive_id}",
             "preview_url": f"/api/files/preview/{paper.google_drive_id}",
-            "thumbnail_url": f"https://drive.google.com/thumbnail?id={paper.google_drive_id}&sz=w600"
+            "thumbnail_url": thumbnail_url(paper.google_drive_id, "w600")
         }
         
     except HTTPException:
@@ -248,7 +248,7 @@ async def upload_textbook(
     try:
         validate_pdf_file(file)
         
-        drive_manager = GoogleDriveManager()
+        drive_manager = get_drive_manager()
         
         file_id, shareable_link = await drive_manager.upload_file_from_upload(
             file=file,
@@ -279,7 +279,7 @@ async def upload_textbook(
             "file_id": file_id,
             "download_url": f"/api/files/download/{file_id}",
             "preview_url": f"/api/files/preview/{file_id}",
-            "thumbnail_url": f"https://drive.google.com/thumbnail?id={file_id}&sz=w400",
+            "thumbnail_url": thumbnail_url(file_id, "w400"),
             "message": "Textbook uploaded successfully"
         }
         
@@ -322,7 +322,7 @@ async def list_textbooks(
                 "created_at": t.created_at.isoformat(),
                 "download_url": f"/api/files/download/{t.google_drive_id}",
                 "preview_url": f"/api/files/preview/{t.google_drive_id}",
-                "thumbnail_url": f"https://drive.google.com/thumbnail?id={t.google_drive_id}&sz=w400"
+                "thumbnail_url": thumbnail_url(t.google_drive_id, "w400")
             }
             for t in textbooks
         ]
@@ -355,7 +355,7 @@ async def get_textbook(textbook_id: int, db: Session = Depends(get_db)):
             "created_at": textbook.created_at.isoformat(),
             "download_url": f"/api/files/download/{textbook.google_drive_id}",
             "preview_url": f"/api/files/preview/{textbook.google_drive_id}",
-            "thumbnail_url": f"https://drive.google.com/thumbnail?id={textbook.google_drive_id}&sz=w600"
+            "thumbnail_url": thumbnail_url(textbook.google_drive_id, "w600")
         }
         
     except HTTPException:
@@ -397,7 +397,7 @@ async def upload_study_note(
     try:
         validate_pdf_file(file)
         
-        drive_manager = GoogleDriveManager()
+        drive_manager = get_drive_manager()
         
         file_id, shareable_link = await drive_manager.upload_file_from_upload(
             file=file,
@@ -429,7 +429,7 @@ async def upload_study_note(
             "file_id": file_id,
             "download_url": f"/api/files/download/{file_id}",
             "preview_url": f"/api/files/preview/{file_id}",
-            "thumbnail_url": f"https://drive.google.com/thumbnail?id={file_id}&sz=w400",
+            "thumbnail_url": thumbnail_url(file_id, "w400"),
             "message": "Study note uploaded successfully"
         }
         
@@ -474,7 +474,7 @@ async def list_study_notes(
                 "is_public": n.is_public,
                 "download_url": f"/api/files/download/{n.google_drive_id}",
                 "preview_url": f"/api/files/preview/{n.google_drive_id}",
-                "thumbnail_url": f"https://drive.google.com/thumbnail?id={n.google_drive_id}&sz=w400"
+                "thumbnail_url": thumbnail_url(n.google_drive_id, "w400")
             }
             for n in notes
         ]
@@ -519,7 +519,7 @@ async def get_study_note(
             "is_public": note.is_public,
             "download_url": f"/api/files/download/{note.google_drive_id}",
             "preview_url": f"/api/files/preview/{note.google_drive_id}",
-            "thumbnail_url": f"https://drive.google.com/thumbnail?id={note.google_drive_id}&sz=w600"
+            "thumbnail_url": thumbnail_url(note.google_drive_id, "w600")
         }
         
     except HTTPException:
@@ -541,8 +541,7 @@ async def download_file(file_id: str):
     Usage:
         GET /api/files/download/{google_drive_file_id}
     """
-    drive_manager = GoogleDriveManager()
-    download_url = drive_manager.get_direct_download_url(file_id)
+    download_url = direct_download_url(file_id)
     return RedirectResponse(url=download_url)
 
 
@@ -555,9 +554,7 @@ async def preview_file(file_id: str):
         GET /api/files/preview/{google_drive_file_id}
         or embed in iframe: <iframe src="/api/files/preview/{file_id}"></iframe>
     """
-    drive_manager = GoogleDriveManager()
-    preview_url = drive_manager.get_preview_url(file_id)
-    return RedirectResponse(url=preview_url)
+    return RedirectResponse(url=preview_url(file_id))
 
 
 @router.get("/thumbnail/{file_id}")
@@ -572,9 +569,7 @@ async def get_thumbnail(file_id: str, size: str = "w400"):
     Returns:
         JSON with thumbnail URL
     """
-    drive_manager = GoogleDriveManager()
-    thumbnail_url = drive_manager.get_thumbnail_url(file_id, size)
-    return {"thumbnail_url": thumbnail_url, "file_id": file_id}
+    return {"thumbnail_url": thumbnail_url(file_id, size), "file_id": file_id}
 
 
 @router.get("/info/{file_id}")
@@ -586,7 +581,7 @@ async def get_file_info(file_id: str):
         File information (name, size, MIME type, etc.)
     """
     try:
-        drive_manager = GoogleDriveManager()
+        drive_manager = get_drive_manager()
         file_info = drive_manager.get_file_info(file_id)
         
         if not file_info:
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from datetime import datetime
 
-from ..core.database import get_db
+from ..core.database import get_db, split_tags
 from ..core.security import get_current_user
 from ..models.user import User
 from ..models.forum import ForumPost, ForumComment
@@ -25,7 +25,7 @@ def create_post(
         title=title,
         content=content,
         category=category,
-        tags=tags
+        tags=split_tags(tags)
     )
     
     db.add(post)
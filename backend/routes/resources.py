@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import List
 
-from ..core.database import get_db
+from ..core.database import get_db, split_tags
 from ..core.security import get_current_user
 from ..models.user import User
 from ..models.resource import Resource, ResourceCategory, ResourceLike, ResourceComment
@@ -27,8 +27,8 @@ def create_resource(
         title=title,
         description=description,
         content=content,
-        category=category,
-        tags=tags
+        category=category.value,
+        tags=split_tags(tags)
     )
     
     db.add(resource)
@@ -53,7 +53,7 @@ def list_resources(
     query = db.query(Resource).filter(Resource.is_published == True)
     
     if category:
-        query = query.filter(Resource.category == category)
+        query = query.filter(Resource.category == category.value)
     
     resources = query.offset(skip).limit(limit).all()
     
@@ -90,7 +90,7 @@ def get_resource(resource_id: int, db: Session = Depends(get_db)):
         "category": resource.category,
         "author": resource.user.username,
         "views": resource.views,
-        "tags": resource.tags.split(",") if resource.tags else [],
+        "tags": resource.tags or [],
         "created_at": resource.created_at
     }
 